@@ -1,14 +1,12 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import json
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
+import io
+import hashlib
+import tempfile
 import os
-import re
-from profanity import english_profanity_checker, process_file
+from profanity import process_file
 from privacy import PrivacyComplianceDetector
+from overlap import detect_crosstalk, detect_overlaps
+from transcripts import Transcript, iter_jsonl_records, read_transcript
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -63,62 +61,178 @@ st.markdown(
 # Sidebar for navigation and options
 st.sidebar.markdown("## Analysis Options")
 
-# File uploader
-uploaded_file = st.sidebar.file_uploader("Upload JSON Call Transcript", type=["json"])
-if uploaded_file is not None:
-    # Read the file content
-    file_content = uploaded_file.read()
 
+# Cached parsing and analysis helpers. Streamlit reruns this script on every
+# interaction; these keep parsed uploads, models and results across reruns.
+# An upload is parsed once into a Transcript that every analysis shares.
+@st.cache_data(show_spinner=False)
+def parse_transcript(file_bytes):
+    return read_transcript(io.BytesIO(file_bytes))
+
+
+@st.cache_data(show_spinner=False)
+def list_jsonl_calls(file_bytes):
+    return [record["call_id"] for record in iter_jsonl_records(io.BytesIO(file_bytes))]
+
+
+@st.cache_data(show_spinner=False)
+def load_jsonl_call(file_bytes, call_id):
+    for record in iter_jsonl_records(io.BytesIO(file_bytes)):
+        if record["call_id"] == call_id:
+            return Transcript.from_dicts(record["transcript"])
+    return Transcript.from_dicts([])
+
+
+@st.cache_resource
+def get_compliance_checker():
+    return PrivacyComplianceDetector(api_key=os.environ.get("GROQ_API_KEY"))
+
+
+# Results are keyed by the content hash of the transcript plus the analysis
+# options; the underscore argument is excluded from Streamlit's own hashing.
+@st.cache_data(show_spinner=False)
+def run_profanity_analysis(content_hash, use_llm, _data):
+    return process_file(filepath="", file_upload=_data, upload=True, use_llm=use_llm)
+
+
+@st.cache_data(show_spinner=False)
+def run_compliance_check(content_hash, _data):
+    result = get_compliance_checker().process_single_file(file_path=_data, upload=True)
+    # Raising keeps failed or rate-limited calls out of the cache, so the
+    # next click retries them
+    if "error" in result:
+        raise RuntimeError(result["error"])
+    return result
+
+
+@st.cache_data(show_spinner=False)
+def run_overlap_analysis(content_hash, _data):
+    return detect_overlaps(_data)
+
+
+@st.cache_data(show_spinner=False)
+def run_crosstalk_analysis(content_hash, _data):
+    return detect_crosstalk(_data)
+
+
+# Corpus mode: aggregates are computed once per set of uploads (or read from a
+# precomputed store) and every chart queries those tables
+@st.cache_data(show_spinner=False)
+def build_corpus_aggregates(content_hash, _files, _verdicts_file):
+    from corpus import build_aggregates, load_verdicts
+
+    # Transcripts go through the same reader and validation as a single
+    # uploaded call; an invalid one raises ValueError naming its file
+    def records():
+        for name, file_bytes in _files:
+            call_id = name
+            try:
+                if name.endswith(".jsonl"):
+                    for record in iter_jsonl_records(io.BytesIO(file_bytes)):
+                        call_id = f"{name} ({record['call_id']})"
+                        record["transcript"] = Transcript.from_dicts(
+                            record["transcript"]
+                        )
+                        yield record
+                else:
+                    yield {"call_id": name, "transcript": parse_transcript(file_bytes)}
+            except ValueError as e:
+                raise ValueError(f"{call_id}: {e}") from e
+
+    verdicts = None
+    if _verdicts_file is not None:
+        name, file_bytes = _verdicts_file
+        suffix = ".jsonl" if name.endswith(".jsonl") else ".csv"
+        with tempfile.NamedTemporaryFile(suffix=suffix) as f:
+            f.write(file_bytes)
+            f.flush()
+            verdicts = load_verdicts(f.name)
+
+    return build_aggregates(records(), verdicts)
+
+
+@st.cache_data(show_spinner=False)
+def load_corpus_aggregates(directory):
+    from corpus import load_aggregates
+
+    return load_aggregates(directory)
+
+
+# Per-call overlap data written by overlap_store.py; charts are drawn only
+# for the call being viewed, previews come from a bounded thumbnail cache
+@st.cache_resource
+def open_overlap_store(directory):
+    from overlap_store import OverlapStore
+
+    return OverlapStore(directory)
+
+
+@st.cache_resource
+def get_thumbnail_cache(directory):
+    from overlap_store import ThumbnailCache
+
+    return ThumbnailCache(open_overlap_store(directory))
+
+
+# Single call analysis, or fleet views over many calls
+mode = st.sidebar.radio("Mode", ["Single Call", "Corpus"])
+
+uploaded_file = None
+if mode == "Corpus":
+    corpus_files = st.sidebar.file_uploader(
+        "Upload Call Transcripts", type=["json", "jsonl"], accept_multiple_files=True
+    )
+    verdicts_upload = st.sidebar.file_uploader(
+        "Compliance Results (optional)", type=["csv", "jsonl"]
+    )
+    aggregates_dir = st.sidebar.text_input("Or Load Precomputed Aggregates From", "")
+    overlap_store_dir = st.sidebar.text_input("Overlap Store (optional)", "")
+else:
+    # File uploader
+    uploaded_file = st.sidebar.file_uploader(
+        "Upload JSON Call Transcript", type=["json", "jsonl"]
+    )
+if uploaded_file is not None and uploaded_file.name.endswith(".jsonl"):
+    # JSONL export: one call per line, only the chosen call is decoded
+    file_bytes = uploaded_file.getvalue()
+    selected_call = st.sidebar.selectbox("Select Call", list_jsonl_calls(file_bytes))
     try:
-        # Parse the JSON string to a Python dictionary
-        data_dict = json.loads(file_content)
-    except json.JSONDecodeError as e:
-        st.error(f"Invalid JSON file: {e}")
+        data_dict = load_jsonl_call(file_bytes, selected_call)
+    except ValueError as e:
+        st.error(f"Invalid transcript in {selected_call}: {e}")
+    content_hash = hashlib.sha256(
+        file_bytes + str(selected_call).encode("utf-8")
+    ).hexdigest()
+elif uploaded_file is not None:
+    # Read the file content
+    file_bytes = uploaded_file.getvalue()
+    content_hash = hashlib.sha256(file_bytes).hexdigest()
 
-# Analysis type selector
-analysis_type = st.sidebar.radio(
-    "Select Analysis Type",
-    ["Profanity Detection", "Compliance Check", "Speech Overlap Analysis"],
-)
+    try:
+        # Parse the JSON into a Transcript
+        data_dict = parse_transcript(file_bytes)
+    except ValueError as e:
+        st.error(f"Invalid transcript file: {e}")
 
+# Results computed in this session, keyed by (analysis, content hash, options)
+if "analysis_results" not in st.session_state:
+    st.session_state["analysis_results"] = {}
+analysis_results = st.session_state["analysis_results"]
 
-# Function to detect overlaps in a call transcript
-def detect_overlaps(call_data):
-    """Detect overlapping speech segments between Agent and Customer."""
-    agent_segments = [
-        entry for entry in call_data if entry["speaker"].lower() == "agent"
-    ]
-    customer_segments = [
-        entry for entry in call_data if entry["speaker"].lower() == "customer"
-    ]
-
-    overlaps = []
-    for a in agent_segments:
-        for c in customer_segments:
-            if (a["stime"] < c["etime"]) and (a["etime"] > c["stime"]):
-                overlap_start = max(a["stime"], c["stime"])
-                overlap_end = min(a["etime"], c["etime"])
-                overlap_duration = overlap_end - overlap_start
-                if overlap_duration > 0:
-                    overlaps.append(
-                        {
-                            "overlap_start": overlap_start,
-                            "overlap_end": overlap_end,
-                            "overlap_duration": overlap_duration,
-                            "agent_stime": a["stime"],
-                            "agent_etime": a["etime"],
-                            "customer_stime": c["stime"],
-                            "customer_etime": c["etime"],
-                            "initiator": "Customer"
-                            if c["stime"] > a["stime"]
-                            else "Agent",
-                        }
-                    )
-    return overlaps
+# Analysis type selector
+if mode == "Single Call":
+    analysis_type = st.sidebar.radio(
+        "Select Analysis Type",
+        ["Profanity Detection", "Compliance Check", "Speech Overlap Analysis"],
+    )
 
 
 # Profanity analysis visualization function
 def display_profanity_results(profanity_data):
+    # pandas and plotly are only needed once there are results to chart
+    import pandas as pd
+    import plotly.express as px
+
     st.markdown(
         "<h2 class='sub-header'>Profanity Detection Results</h2>",
         unsafe_allow_html=True,
@@ -243,16 +357,27 @@ def display_compliance_results(compliance_data):
 
 
 # Overlap analysis visualization function
-def display_overlap_results(call_data):
+def display_overlap_results(
+    call_data, overlaps=None, call_end_time=None, crosstalk=None
+):
+    import pandas as pd
+    import plotly.express as px
+
     st.markdown(
         "<h2 class='sub-header'>Speech Overlap Analysis</h2>", unsafe_allow_html=True
     )
 
-    # Detect overlaps
-    overlaps = detect_overlaps(call_data)
+    # All speakers first (detect_crosstalk), then the Agent/Customer detail
+    if crosstalk is not None:
+        display_crosstalk_results(crosstalk)
+        st.markdown("### Agent / Customer Overlaps")
+
+    # Detect overlaps unless they were already computed
+    if overlaps is None:
+        overlaps = detect_overlaps(call_data)
 
     if not overlaps:
-        st.info("No speech overlaps detected in this call.")
+        st.info("No Agent/Customer speech overlaps detected in this call.")
         return
 
     # Convert to DataFrame for easier manipulation
@@ -272,7 +397,8 @@ def display_overlap_results(call_data):
         )
 
     # Determine call end time
-    call_end_time = max([entry["etime"] for entry in call_data])
+    if call_end_time is None:
+        call_end_time = max([entry["etime"] for entry in call_data])
 
     # 1. Overlap Duration Over Time (similar to third image)
     st.markdown("### Overlapping Speech Duration Over Time")
@@ -362,8 +488,233 @@ def display_overlap_results(call_data):
         st.dataframe(overlap_df)
 
 
+# Crosstalk between every speaker of a call (conference, transfer, barge-in)
+def display_crosstalk_results(crosstalk):
+    import pandas as pd
+    import plotly.express as px
+
+    speakers = crosstalk["speakers"]
+    timeline = pd.DataFrame(crosstalk["timeline"])
+    if len(speakers) < 2 or timeline.empty:
+        st.info("Crosstalk analysis needs at least two speakers.")
+        return
+
+    run_length = timeline["end"] - timeline["start"]
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Speakers", len(speakers))
+    with col2:
+        st.metric(
+            "Crosstalk Time", f"{run_length[timeline['speakers'] >= 2].sum():.2f}s"
+        )
+    with col3:
+        st.metric("Most Simultaneous Speakers", int(timeline["speakers"].max()))
+
+    # 1. Pairwise crosstalk matrices
+    st.markdown("### Pairwise Crosstalk")
+    col1, col2 = st.columns(2)
+    for column, key, title in [
+        (col1, "overlap_duration", "Overlap Duration (seconds)"),
+        (col2, "overlap_count", "Overlapping Segment Pairs"),
+    ]:
+        fig = px.imshow(
+            crosstalk[key],
+            x=speakers,
+            y=speakers,
+            text_auto=".1f" if key == "overlap_duration" else True,
+            color_continuous_scale="Purples",
+            title=title,
+        )
+        with column:
+            st.plotly_chart(fig, use_container_width=True)
+
+    # 2. Simultaneous speakers over time (step chart)
+    st.markdown("### Simultaneous Speakers Over Time")
+    steps = pd.DataFrame(
+        {
+            "time": list(timeline["start"]) + [timeline["end"].iloc[-1]],
+            "speakers": list(timeline["speakers"]) + [timeline["speakers"].iloc[-1]],
+        }
+    )
+    fig = px.line(
+        steps,
+        x="time",
+        y="speakers",
+        line_shape="hv",
+        labels={"time": "Time (seconds)", "speakers": "Speakers Talking"},
+        color_discrete_sequence=["teal"],
+    )
+    fig.update_layout(
+        plot_bgcolor="white",
+        xaxis=dict(gridcolor="lightgray"),
+        yaxis=dict(gridcolor="lightgray", dtick=1),
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    # 3. Who talks over whom
+    st.markdown("### Overlap Initiators")
+    initiated = pd.DataFrame(
+        [
+            {"initiator": speakers[i], "talked_over": speakers[j], "count": count}
+            for i, row in enumerate(crosstalk["initiated"])
+            for j, count in enumerate(row)
+            if count
+        ],
+        columns=["initiator", "talked_over", "count"],
+    )
+    fig = px.bar(
+        initiated,
+        x="initiator",
+        y="count",
+        color="talked_over",
+        labels={
+            "initiator": "Started Talking",
+            "count": "Overlaps",
+            "talked_over": "While Talking",
+        },
+    )
+    fig.update_layout(plot_bgcolor="white", yaxis=dict(gridcolor="lightgray"))
+    st.plotly_chart(fig, use_container_width=True)
+
+    with st.expander("View Raw Crosstalk Data"):
+        st.dataframe(pd.DataFrame(crosstalk["overlaps"]))
+
+
+# Corpus dashboard visualization function
+def display_corpus_results(tables):
+    import plotly.express as px
+
+    st.markdown("<h2 class='sub-header'>Corpus Overview</h2>", unsafe_allow_html=True)
+
+    calls = tables["calls"]
+    if calls.empty:
+        st.info("No calls in this corpus.")
+        return
+
+    audited = calls[calls["is_violation"].notna()]
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Calls", len(calls))
+    with col2:
+        st.metric(
+            "Calls With Profanity", f"{(calls['profane_utterances'] > 0).mean():.1%}"
+        )
+    with col3:
+        st.metric(
+            "Violation Rate",
+            (
+                f"{audited['is_violation'].astype(bool).mean():.1%}"
+                if len(audited)
+                else "n/a"
+            ),
+        )
+    with col4:
+        st.metric("Median Overlap Ratio", f"{calls['overlap_ratio'].median():.1%}")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        fig = px.bar(
+            tables["profanity_by_agent"],
+            x="agent_id",
+            y="profanity_rate",
+            title="Profanity Rate per Agent",
+            labels={"agent_id": "Agent", "profanity_rate": "Calls With Profanity"},
+            color_discrete_sequence=["indianred"],
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+    with col2:
+        if tables["violations_by_day"].empty:
+            st.info("Load compliance results to see violation rates.")
+        else:
+            fig = px.bar(
+                tables["violations_by_day"],
+                x="call_date",
+                y="violation_rate",
+                title="Violation Rate per Day",
+                labels={"call_date": "Date", "violation_rate": "Violation Rate"},
+                color_discrete_sequence=["darkorange"],
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+    fig = px.histogram(
+        calls,
+        x="overlap_ratio",
+        nbins=30,
+        title="Overlap Ratio Distribution Across Calls",
+        labels={"overlap_ratio": "Overlapping Speech / Call Duration"},
+        color_discrete_sequence=["teal"],
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    with st.expander("View Per-Call Metrics"):
+        st.dataframe(calls)
+
+
+# Overlap store drill-down: previews of the calls with the most overlap, then
+# the full charts for one selected call
+def display_overlap_store(directory):
+    from overlap_store import CHARTS
+
+    store = open_overlap_store(directory)
+    st.markdown("<h2 class='sub-header'>Call Drill-Down</h2>", unsafe_allow_html=True)
+
+    calls = store.calls.sort_values("total_overlap_duration", ascending=False)
+    if st.checkbox("Show Previews of the Most Overlapping Calls", value=False):
+        thumbnails = get_thumbnail_cache(directory)
+        chart = st.selectbox("Preview Chart", CHARTS)
+        columns = st.columns(4)
+        for i, call_id in enumerate(calls["call_id"].head(8)):
+            with columns[i % 4]:
+                st.image(thumbnails.get(call_id, chart), caption=call_id)
+
+    call_id = st.selectbox("Select Call", calls["call_id"])
+    row = store.call(call_id)
+    display_overlap_results(
+        None,
+        store.overlaps(call_id).to_dict("records"),
+        call_end_time=row["call_end"],
+    )
+
+
 # Check if a file is uploaded
-if uploaded_file is not None:
+if mode == "Corpus":
+    try:
+        tables = None
+        if aggregates_dir:
+            tables = load_corpus_aggregates(aggregates_dir)
+        elif corpus_files:
+            files = [(f.name, f.getvalue()) for f in corpus_files]
+            verdicts_file = (
+                (verdicts_upload.name, verdicts_upload.getvalue())
+                if verdicts_upload is not None
+                else None
+            )
+            digest = hashlib.sha256()
+            for name, file_bytes in files + ([verdicts_file] if verdicts_file else []):
+                digest.update(name.encode("utf-8"))
+                digest.update(hashlib.sha256(file_bytes).digest())
+            with st.spinner("Computing corpus aggregates..."):
+                try:
+                    tables = build_corpus_aggregates(
+                        digest.hexdigest(), files, verdicts_file
+                    )
+                except ValueError as e:
+                    st.error(f"Invalid transcript file {e}")
+
+        if tables is not None:
+            display_corpus_results(tables)
+        if overlap_store_dir:
+            display_overlap_store(overlap_store_dir)
+        if tables is None and not overlap_store_dir:
+            st.info(
+                "Upload call transcripts or enter an aggregates directory to begin."
+            )
+    except Exception as e:
+        st.error(f"Error processing the corpus: {str(e)}")
+elif uploaded_file is not None:
     try:
         # Display relevant analysis based on selection
         if analysis_type == "Profanity Detection":
@@ -375,50 +726,50 @@ if uploaded_file is not None:
             # Option to use LLM
             use_llm = st.sidebar.checkbox("Use LLM for Enhanced Detection", value=False)
 
-            # Simulate profanity results with sample data
+            result_key = (analysis_type, content_hash, use_llm)
             if st.button("Run Profanity Analysis"):
                 with st.spinner("Analyzing profanity in transcript..."):
-                    # Display sample profanity results
-                    prof_res = process_file(
-                        filepath="", file_upload=data_dict, upload=True
+                    analysis_results[result_key] = run_profanity_analysis(
+                        content_hash, use_llm, data_dict
                     )
-                    display_profanity_results(prof_res)
+            if result_key in analysis_results:
+                display_profanity_results(analysis_results[result_key])
 
         elif analysis_type == "Compliance Check":
             st.markdown(
                 "<h2 class='sub-header'>Compliance Check</h2>", unsafe_allow_html=True
             )
 
-            # Simulate compliance results with sample data
+            result_key = (analysis_type, content_hash)
             if st.button("Run Compliance Check"):
                 with st.spinner("Analyzing transcript for compliance violations..."):
-                    # Display sample compliance results
-                    # sample_compliance_data = {
-                    #     "verification_performed": False,
-                    #     "verification_method": "None",
-                    #     "sensitive_info_shared": False,
-                    #     "sensitive_info_type": "None",
-                    #     "is_violation": False,
-                    #     "explanation": "The agent did not share any sensitive information, and there was no verification of the customer's identity performed before any such sharing could occur. The conversation was terminated after the customer denied having an account with Definite Bank, and no sensitive information was disclosed.",
-                    #     "call_id": "00be25b0-458f-4cbf-ae86-ae2ec1f7fba4.json",
-                    # }
-                    compliance_checker = PrivacyComplianceDetector(
-                        api_key=os.environ.get("GROQ_API_KEY"),
-                    )
-
-                    comp_res = compliance_checker.process_single_file(
-                        file_path=data_dict, upload=True
-                    )
-
-                    print(comp_res)
-
-                    display_compliance_results(comp_res)
+                    try:
+                        analysis_results[result_key] = run_compliance_check(
+                            content_hash, data_dict
+                        )
+                    except RuntimeError as e:
+                        analysis_results.pop(result_key, None)
+                        st.error(f"Compliance check failed: {e}")
+            if result_key in analysis_results:
+                display_compliance_results(analysis_results[result_key])
 
         elif analysis_type == "Speech Overlap Analysis":
             # For overlap analysis, use the actual implementation
+            result_key = (analysis_type, content_hash)
             if st.button("Run Overlap Analysis"):
                 with st.spinner("Analyzing speech overlaps in transcript..."):
-                    display_overlap_results(data_dict)
+                    analysis_results[result_key] = (
+                        run_overlap_analysis(content_hash, data_dict),
+                        run_crosstalk_analysis(content_hash, data_dict),
+                    )
+            if result_key in analysis_results:
+                overlaps, crosstalk = analysis_results[result_key]
+                display_overlap_results(
+                    data_dict,
+                    overlaps,
+                    call_end_time=data_dict.end(),
+                    crosstalk=crosstalk,
+                )
 
     except Exception as e:
         st.error(f"Error processing the file: {str(e)}")
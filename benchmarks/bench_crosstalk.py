@@ -0,0 +1,208 @@
+"""Parity check and timing for the N-speaker crosstalk sweep.
+
+overlap.detect_crosstalk is checked against a brute-force pairwise
+reference on random calls with up to five speakers (counts, initiators,
+overlap records, pairwise durations from merged speaker intervals and the
+number of speakers talking at every point in time), and its Agent/Customer
+pair against overlap.detect_overlaps. A Transcript must give the same result
+as its list of dicts. Timing compares the sweep with the pairwise reference.
+
+Run from the repository root:
+    python benchmarks/bench_crosstalk.py
+"""
+
+import os
+import sys
+import time
+import random
+from itertools import combinations
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import generate_call  # noqa: E402
+from overlap import detect_crosstalk, detect_overlaps  # noqa: E402
+from transcripts import Transcript  # noqa: E402
+
+SPEAKERS = ["Agent", "Customer", "Supervisor", "Transfer", "Interpreter"]
+
+
+def random_multi_call(n_segments, seed, n_speakers=4, max_gap=2.0, max_len=6.0):
+    """Random call with n_speakers speakers, ties, touching and nested segments."""
+    rng = random.Random(seed)
+    names = SPEAKERS[:n_speakers]
+    call = []
+    t = 0.0
+    for _ in range(n_segments):
+        t += rng.choice([0, 0.5, rng.uniform(0, max_gap)])
+        length = rng.choice([0, 1, rng.uniform(0, max_len)])
+        speaker = rng.choice(names)
+        call.append(
+            {
+                "speaker": rng.choice([speaker, speaker.lower()]),
+                "text": "",
+                "stime": round(t, 1),
+                "etime": round(t + length, 1),
+            }
+        )
+    rng.shuffle(call)
+    return call
+
+
+def _union(intervals):
+    merged = []
+    for stime, etime in sorted(intervals):
+        if merged and stime <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], etime)
+        else:
+            merged.append([stime, etime])
+    return merged
+
+
+def _intersection_length(first, second):
+    total = 0.0
+    i = j = 0
+    while i < len(first) and j < len(second):
+        total += max(
+            0.0, min(first[i][1], second[j][1]) - max(first[i][0], second[j][0])
+        )
+        if first[i][1] < second[j][1]:
+            i += 1
+        else:
+            j += 1
+    return total
+
+
+def crosstalk_pairwise(call_data, speakers):
+    """Reference: every segment pair compared, durations from merged intervals"""
+    index = {name.lower(): i for i, name in enumerate(speakers)}
+    segments = [
+        (index[e["speaker"].lower()], e["stime"], e["etime"])
+        for e in call_data
+        if e["etime"] > e["stime"]
+    ]
+    n = len(speakers)
+    count = [[0] * n for _ in range(n)]
+    initiated = [[0] * n for _ in range(n)]
+    records = []
+    for (s1, b1, e1), (s2, b2, e2) in combinations(segments, 2):
+        if s1 == s2 or not max(b1, b2) < min(e1, e2):
+            continue
+        count[s1][s2] += 1
+        count[s2][s1] += 1
+        if b2 > b1 or (b2 == b1 and s2 < s1):
+            initiated[s2][s1] += 1
+        else:
+            initiated[s1][s2] += 1
+        a, b = sorted([(s1, b1, e1), (s2, b2, e2)])
+        records.append((a[0], b[0], a[1], a[2], b[1], b[2]))
+
+    unions = [_union([(b, e) for s, b, e in segments if s == i]) for i in range(n)]
+    duration = [
+        [
+            0.0 if i == j else _intersection_length(unions[i], unions[j])
+            for j in range(n)
+        ]
+        for i in range(n)
+    ]
+    talk_time = [sum(e - b for b, e in union) for union in unions]
+    return count, initiated, sorted(records), duration, talk_time, segments
+
+
+def check_call(call_data):
+    result = detect_crosstalk(call_data)
+    speakers = result["speakers"]
+    count, initiated, records, duration, talk_time, segments = crosstalk_pairwise(
+        call_data, speakers
+    )
+    assert result["overlap_count"] == count
+    assert result["initiated"] == initiated
+    index = {name: i for i, name in enumerate(speakers)}
+    got = sorted(
+        (
+            index[o["speaker_a"]],
+            index[o["speaker_b"]],
+            o["a_stime"],
+            o["a_etime"],
+            o["b_stime"],
+            o["b_etime"],
+        )
+        for o in result["overlaps"]
+    )
+    assert got == records
+    starts = [o["overlap_start"] for o in result["overlaps"]]
+    assert starts == sorted(starts)
+    for i in range(len(speakers)):
+        assert abs(result["talk_time"][i] - talk_time[i]) < 1e-6
+        for j in range(len(speakers)):
+            assert abs(result["overlap_duration"][i][j] - duration[i][j]) < 1e-6
+
+    # Timeline: contiguous runs whose speaker count matches every segment midpoint
+    timeline = result["timeline"]
+    for run, next_run in zip(timeline, timeline[1:]):
+        assert (
+            run["end"] == next_run["start"] and run["speakers"] != next_run["speakers"]
+        )
+    for run in timeline:
+        middle = (run["start"] + run["end"]) / 2
+        talking = {s for s, b, e in segments if b <= middle < e}
+        assert len(talking) == run["speakers"]
+
+    # The Agent/Customer pair is exactly what detect_overlaps finds
+    lowered = [name.lower() for name in speakers]
+    if "agent" in lowered and "customer" in lowered:
+        agent, customer = lowered.index("agent"), lowered.index("customer")
+        expected = detect_overlaps(call_data)
+        assert count[agent][customer] == len(expected)
+        assert initiated[agent][customer] == sum(
+            o["initiator"] == "Agent" for o in expected
+        )
+        pair = sorted(
+            (o["a_stime"], o["a_etime"], o["b_stime"], o["b_etime"])
+            for o in result["overlaps"]
+            if {o["speaker_a"], o["speaker_b"]} == {speakers[agent], speakers[customer]}
+        )
+        assert pair == sorted(
+            (
+                o["agent_stime"],
+                o["agent_etime"],
+                o["customer_stime"],
+                o["customer_etime"],
+            )
+            for o in expected
+        )
+
+    assert detect_crosstalk(Transcript.from_dicts(call_data)) == result
+
+
+def time_it(func, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    for seed in range(400):
+        check_call(
+            random_multi_call(random.Random(seed).randint(0, 80), seed, 1 + seed % 5)
+        )
+    check_call([])
+    for seed in range(20):
+        check_call(generate_call(200, seed=seed, extra_speakers=("Supervisor",)))
+    print("Parity OK on 421 calls")
+
+    print(f"{'segments':>9} {'pairwise':>11} {'sweep':>10} {'speedup':>8}")
+    for n_segments in (500, 2000, 5000):
+        call_data = generate_call(
+            n_segments, seed=n_segments, extra_speakers=("Supervisor", "Transfer")
+        )
+        speakers = detect_crosstalk(call_data)["speakers"]
+        pairwise = time_it(crosstalk_pairwise, call_data, speakers, repeat=1)
+        sweep = time_it(detect_crosstalk, call_data)
+        print(
+            f"{n_segments:>9} {pairwise * 1000:>9.1f}ms {sweep * 1000:>8.1f}ms "
+            f"{pairwise / sweep:>7.0f}x"
+        )
@@ -0,0 +1,90 @@
+"""Peak memory and time for loading large per-call JSON transcripts.
+
+Writes synthetic transcripts of increasing size and, in a fresh process for
+each measurement, loads them three ways:
+    json.load            the full list of entry dicts
+    iter_entries         transcripts.iter_transcript_entries (memory-mapped,
+                         incremental decoding and validation), entries
+                         consumed one at a time
+    read_transcript      the same stream collected into a columnar Transcript
+
+Peak RSS is the process's high-water mark (VmHWM, reset just before
+loading) minus its resident size at that point, so Linux only. ru_maxrss is
+not used: after fork and exec it can report the parent's peak.
+
+Run from the repository root:
+    python benchmarks/bench_ingest.py [segments ...]
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+MODES = ["json.load", "iter_entries", "read_transcript"]
+
+
+def memory_status_kib():
+    """(VmRSS, VmHWM) of this process in KiB"""
+    status = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(("VmRSS:", "VmHWM:")):
+                status[line.split(":")[0]] = int(line.split()[1])
+    return status["VmRSS"], status["VmHWM"]
+
+
+def measure(mode, path):
+    from transcripts import iter_transcript_entries, read_transcript
+
+    # Writing 5 to clear_refs resets VmHWM to the current RSS
+    with open("/proc/self/clear_refs", "w") as f:
+        f.write("5")
+    baseline = memory_status_kib()[0]
+    start = time.perf_counter()
+    if mode == "json.load":
+        with open(path, "r", encoding="utf-8") as f:
+            count = len(json.load(f))
+    elif mode == "iter_entries":
+        count = sum(1 for _ in iter_transcript_entries(path))
+    else:
+        count = len(read_transcript(path))
+    elapsed = time.perf_counter() - start
+    peak = memory_status_kib()[1] - baseline
+    print(json.dumps({"count": count, "seconds": elapsed, "peak_kib": peak}))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--measure":
+        measure(sys.argv[2], sys.argv[3])
+        sys.exit()
+
+    from synthetic import generate_call
+
+    sizes = [int(n) for n in sys.argv[1:]] or [10_000, 100_000, 400_000]
+    with tempfile.TemporaryDirectory() as directory:
+        for n_segments in sizes:
+            path = os.path.join(directory, f"call-{n_segments}.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(generate_call(n_segments, seed=n_segments), f)
+            size_mib = os.path.getsize(path) / 2**20
+
+            for mode in MODES:
+                output = subprocess.run(
+                    [sys.executable, __file__, "--measure", mode, path],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                ).stdout
+                result = json.loads(output)
+                assert result["count"] == n_segments
+                print(
+                    f"{n_segments:>8} segments ({size_mib:6.1f} MiB)  {mode:<16}"
+                    f"{result['seconds']:7.2f} s  peak +{result['peak_kib'] / 1024:7.1f} MiB"
+                )
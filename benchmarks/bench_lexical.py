@@ -0,0 +1,116 @@
+"""Microbenchmark of the lexical profanity stages.
+
+Compares the precompiled LexicalProfanityEngine used by
+profanity.lexical_profanity_checker against the previous implementation
+(nine re.finditer calls, then better_profanity contains_profanity/censor),
+after checking that every wordlist entry better_profanity flags is flagged
+by the engine too.
+
+Run from the repository root:
+    python benchmarks/bench_lexical.py [n_utterances]
+"""
+
+import os
+import re
+import sys
+import json
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from better_profanity import profanity  # noqa: E402
+from profanity import lexical_profanity_checker  # noqa: E402
+
+
+def legacy_lexical_checker(text):
+    """The regex and dictionary stages as they were before the compiled engine."""
+    english_regex_patterns = [
+        r"\bf+[^\w]*u+[^\w]*c+[^\w]*k+\w*",
+        r"\bf+[^\w]*\*+[^\w]*c+[^\w]*k+\w*",
+        r"\bs+[^\w]*h+[^\w]*i+[^\w]*t+\w*",
+        r"\bs+[^\w]*\*+[^\w]*\*+[^\w]*t+\w*",
+        r"\bn+[^\w]*i+[^\w]*g+[^\w]*g+[^\w]*[^\w]*r+\w*",
+        r"\bb+[^\w]*i+[^\w]*t+[^\w]*c+[^\w]*h+\w*",
+        r"\ba+[^\w]*s+[^\w]*s+[^\w]*h+[^\w]*o+[^\w]*l+[^\w]*e+\w*",
+        r"\bp+[^\w]*[uo]+[^\w]*r+[^\w]*n+\w*",
+        r"\bp+[^\w]*e+[^\w]*n+[^\w]*i+[^\w]*s+\w*",
+    ]
+
+    regex_matches = []
+    for pattern in english_regex_patterns:
+        for match in re.finditer(pattern, text, re.IGNORECASE):
+            regex_matches.append(match.group(0))
+
+    if regex_matches:
+        return True, "regex", regex_matches
+
+    if profanity.contains_profanity(text):
+        censored = profanity.censor(text, "*")
+        profane_terms = [
+            original
+            for original, censored in zip(text.split(), censored.split())
+            if "*" in censored
+        ]
+        return True, "dictionary", profane_terms
+
+    return None
+
+
+def check_wordlist_recall():
+    """
+    Every wordlist entry better_profanity flags must be flagged by the
+    engine, on its own and inside a sentence. The engine may flag more:
+    better_profanity misses some entries at the edges of the text.
+    """
+    profanity.load_censor_words()
+    words = sorted(str(word) for word in profanity.CENSOR_WORDSET)
+    engine_only = 0
+    for word in words:
+        for text in (word, f"you {word} again"):
+            legacy = profanity.contains_profanity(text)
+            flagged = lexical_profanity_checker(text) is not None
+            assert flagged or not legacy, f"engine misses {text!r}"
+            engine_only += flagged and not legacy
+    print(
+        f"{len(words)} wordlist entries: every better_profanity hit is flagged "
+        f"({engine_only} texts flagged only by the engine)"
+    )
+
+
+def load_utterances(conversations_dir="All_Conversations"):
+    utterances = []
+    for filename in sorted(os.listdir(conversations_dir)):
+        if filename.endswith(".json"):
+            with open(os.path.join(conversations_dir, filename), encoding="utf-8") as f:
+                utterances.extend(entry.get("text", "") for entry in json.load(f))
+    return utterances
+
+
+def utterances_per_second(func, utterances):
+    start = time.perf_counter()
+    for text in utterances:
+        func(text)
+    return len(utterances) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    check_wordlist_recall()
+
+    utterances = load_utterances()
+    if len(sys.argv) > 1:
+        n_utterances = int(sys.argv[1])
+        utterances = (utterances * (n_utterances // len(utterances) + 1))[:n_utterances]
+
+    legacy = [legacy_lexical_checker(text) for text in utterances]
+    engine = [lexical_profanity_checker(text) for text in utterances]
+    same_verdict = sum(
+        (old and old[:2]) == (new and new[:2]) for old, new in zip(legacy, engine)
+    )
+    print(f"{len(utterances)} utterances, verdict/method agreement {same_verdict}")
+
+    legacy_rate = utterances_per_second(legacy_lexical_checker, utterances)
+    engine_rate = utterances_per_second(lexical_profanity_checker, utterances)
+    print(f"legacy : {legacy_rate:10.0f} utterances/s")
+    print(
+        f"engine : {engine_rate:10.0f} utterances/s ({engine_rate / legacy_rate:.1f}x)"
+    )
@@ -0,0 +1,136 @@
+"""Replay load test for the streaming profanity monitor.
+
+Recorded calls from All_Conversations are replayed as live traffic: each
+call starts at a random offset and emits every utterance when it ends
+(etime), sped up by --speedup, so many calls talk over each other just as
+they would on a busy floor. The utterances go through ProfanityMonitor in
+process, and the flagged set is checked against check_profanity_batch.
+
+Run from the repository root:
+    python benchmarks/bench_monitor.py [--calls 250] [--speedup 50]
+
+With --emit the paced NDJSON stream is written to stdout instead, to load
+the real service over stdin or a socket:
+    python benchmarks/bench_monitor.py --emit | python monitor.py
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from monitor import ProfanityMonitor  # noqa: E402
+from profanity import check_profanity_batch  # noqa: E402
+
+
+def load_calls(conversations_dir="All_Conversations"):
+    calls = []
+    for filename in sorted(os.listdir(conversations_dir)):
+        if filename.endswith(".json"):
+            with open(os.path.join(conversations_dir, filename), encoding="utf-8") as f:
+                calls.append((filename, json.load(f)))
+    return calls
+
+
+def replay_schedule(calls, n_calls, spread, seed=0):
+    """(send_at, utterance) pairs for n_calls calls starting within spread seconds"""
+    rng = random.Random(seed)
+    schedule = []
+    for i in range(n_calls):
+        call_id, transcript = calls[i % len(calls)]
+        offset = rng.uniform(0, spread)
+        for entry in transcript:
+            utterance = dict(entry, call_id=f"{i}-{call_id}")
+            schedule.append((offset + entry["etime"], utterance))
+    schedule.sort(key=lambda item: item[0])
+    return schedule
+
+
+async def paced(schedule, speedup):
+    """Yield utterances at their scheduled (sped up) wall-clock time"""
+    start = time.perf_counter()
+    for send_at, utterance in schedule:
+        delay = send_at / speedup - (time.perf_counter() - start)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        yield utterance
+
+
+async def run_replay(schedule, speedup, max_batch_size, max_batch_delay):
+    events = []
+    monitor = ProfanityMonitor(
+        on_event=events.append,
+        max_batch_size=max_batch_size,
+        max_batch_delay=max_batch_delay,
+    )
+    await monitor.start()
+
+    start = time.perf_counter()
+    async for utterance in paced(schedule, speedup):
+        await monitor.submit(utterance)
+    await monitor.stop()
+    elapsed = time.perf_counter() - start
+    return monitor.stats(), events, elapsed
+
+
+def emit(schedule, speedup):
+    start = time.perf_counter()
+    for send_at, utterance in schedule:
+        delay = send_at / speedup - (time.perf_counter() - start)
+        if delay > 0:
+            time.sleep(delay)
+        sys.stdout.write(json.dumps(utterance, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=250)
+    parser.add_argument("--spread", type=float, default=300.0)
+    parser.add_argument("--speedup", type=float, default=50.0)
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-batch-delay-ms", type=float, default=50.0)
+    parser.add_argument("--emit", action="store_true")
+    args = parser.parse_args()
+
+    schedule = replay_schedule(load_calls(), args.calls, args.spread)
+    if args.emit:
+        emit(schedule, args.speedup)
+        sys.exit(0)
+
+    stats, events, elapsed = asyncio.run(
+        run_replay(
+            schedule,
+            args.speedup,
+            args.max_batch_size,
+            args.max_batch_delay_ms / 1000,
+        )
+    )
+
+    texts = [utterance["text"] for _, utterance in schedule]
+    expected = {
+        (utterance["call_id"], utterance["stime"], method)
+        for (_, utterance), (is_profane, method, _) in zip(
+            schedule, check_profanity_batch(texts)
+        )
+        if is_profane
+    }
+    flagged = {
+        (e["call_id"], e["timestamp_start"], e["detection_method"]) for e in events
+    }
+    assert flagged == expected, "monitor verdicts differ from check_profanity_batch"
+    print(f"Parity OK: {len(flagged)} flagged utterances")
+
+    print(
+        f"{stats['received']} utterances from {args.calls} calls in {elapsed:.1f}s "
+        f"({stats['received'] / elapsed:.0f} utterances/s offered)"
+    )
+    print(
+        f"latency p50 {stats['p50_ms']:.2f} ms, p99 {stats['p99_ms']:.2f} ms, "
+        f"{stats['batches']} ML batches (mean size {stats['mean_batch_size']:.1f})"
+    )
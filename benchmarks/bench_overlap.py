@@ -0,0 +1,188 @@
+"""Parity check and timing for the sweep-based detect_overlaps.
+
+Also checks that the streaming IncrementalOverlapDetector matches
+detect_overlaps when segments arrive out of order within its lateness bound,
+and that a transcripts.Transcript gives the same overlaps as its list of dicts.
+
+Run from the repository root:
+    python benchmarks/bench_overlap.py
+"""
+
+import os
+import sys
+import json
+import random
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from overlap import (  # noqa: E402
+    IncrementalOverlapDetector,
+    detect_overlaps,
+    detect_overlaps_streaming,
+)
+from transcripts import Transcript  # noqa: E402
+
+
+def detect_overlaps_pairwise(call_data):
+    """Reference O(A*C) implementation the sweep must agree with."""
+    agent_segments = [
+        entry for entry in call_data if entry["speaker"].lower() == "agent"
+    ]
+    customer_segments = [
+        entry for entry in call_data if entry["speaker"].lower() == "customer"
+    ]
+
+    overlaps = []
+    for a in agent_segments:
+        for c in customer_segments:
+            if (a["stime"] < c["etime"]) and (a["etime"] > c["stime"]):
+                overlap_start = max(a["stime"], c["stime"])
+                overlap_end = min(a["etime"], c["etime"])
+                overlap_duration = overlap_end - overlap_start
+                if overlap_duration > 0:
+                    overlaps.append(
+                        {
+                            "overlap_start": overlap_start,
+                            "overlap_end": overlap_end,
+                            "overlap_duration": overlap_duration,
+                            "agent_stime": a["stime"],
+                            "agent_etime": a["etime"],
+                            "customer_stime": c["stime"],
+                            "customer_etime": c["etime"],
+                            "initiator": (
+                                "Customer" if c["stime"] > a["stime"] else "Agent"
+                            ),
+                        }
+                    )
+    return overlaps
+
+
+def random_call(n_segments, seed, max_gap=3.0, max_len=6.0):
+    """Build a random two-speaker call with plenty of ties and cross-talk."""
+    rng = random.Random(seed)
+    call = []
+    t = 0.0
+    for _ in range(n_segments):
+        t += rng.choice([0, 0.5, rng.uniform(0, max_gap)])
+        length = rng.choice([0, 1, rng.uniform(0, max_len)])
+        call.append(
+            {
+                "speaker": rng.choice(["Agent", "Customer", "agent", "customer"]),
+                "text": "",
+                "stime": round(t, 1),
+                "etime": round(t + length, 1),
+            }
+        )
+    rng.shuffle(call)
+    return call
+
+
+def jittered_arrival(call_data, lateness, seed):
+    """Order segments by start time, then let each arrive up to `lateness` seconds late."""
+    rng = random.Random(seed)
+    return sorted(call_data, key=lambda e: e["stime"] + rng.uniform(0, lateness))
+
+
+def check_streaming_parity(call_data, seed):
+    """The incremental detector must equal detect_overlaps on the same list."""
+    span = max((e["etime"] for e in call_data), default=0) + 1
+    assert detect_overlaps_streaming(call_data, span) == detect_overlaps(call_data)
+
+    for lateness in (0.0, 1.0, 5.0):
+        arrival = jittered_arrival(call_data, lateness, seed)
+        assert detect_overlaps_streaming(arrival, lateness) == detect_overlaps(arrival)
+
+    # Segments later than allowed_lateness may miss overlaps, but whatever
+    # is emitted must be a real overlap of the call
+    arrival = jittered_arrival(call_data, 10.0, seed)
+    expected = detect_overlaps(arrival)
+    for record in detect_overlaps_streaming(arrival, 0.0):
+        assert record in expected and record["overlap_duration"] > 0
+
+
+def check_late_segment():
+    """A late segment must not pair with open segments that start after it ends."""
+    call_data = [
+        {"speaker": "Customer", "text": "", "stime": 5, "etime": 10},
+        {"speaker": "Customer", "text": "", "stime": 6, "etime": 7},
+        {"speaker": "Customer", "text": "", "stime": 8, "etime": 9},
+        {"speaker": "Agent", "text": "", "stime": 1, "etime": 2},
+        {"speaker": "Agent", "text": "", "stime": 1, "etime": 6},
+    ]
+    detector = IncrementalOverlapDetector(allowed_lateness=0.0)
+    emitted = []
+    for segment in call_data:
+        emitted.extend(detector.add(segment))
+    emitted.extend(detector.close())
+    assert detector.late_segments == 2
+    assert emitted == [
+        o for o in detect_overlaps(call_data) if o["agent_etime"] == 6
+    ], emitted
+
+
+def check_parity(conversations_dir="All_Conversations", n_random=500):
+    """Compare the sweep and the pairwise loop on real and random calls."""
+    checked = 0
+    if os.path.isdir(conversations_dir):
+        for filename in sorted(os.listdir(conversations_dir)):
+            if not filename.endswith(".json"):
+                continue
+            with open(os.path.join(conversations_dir, filename), encoding="utf-8") as f:
+                call_data = json.load(f)
+            assert detect_overlaps(call_data) == detect_overlaps_pairwise(
+                call_data
+            ), filename
+            check_streaming_parity(call_data, seed=checked)
+            assert detect_overlaps(Transcript.from_dicts(call_data)) == detect_overlaps(
+                call_data
+            ), filename
+            # Same entries back, int and float times included (repr tells 5 from 5.0)
+            assert repr(Transcript.from_dicts(call_data).to_dicts()) == repr(
+                call_data
+            ), filename
+            checked += 1
+
+    for seed in range(n_random):
+        call_data = random_call(random.Random(seed).randint(0, 60), seed)
+        assert detect_overlaps(call_data) == detect_overlaps_pairwise(
+            call_data
+        ), f"seed {seed}"
+        check_streaming_parity(call_data, seed)
+        assert detect_overlaps(Transcript.from_dicts(call_data)) == detect_overlaps(
+            call_data
+        ), f"seed {seed}"
+        assert repr(Transcript.from_dicts(call_data).to_dicts()) == repr(
+            call_data
+        ), f"seed {seed}"
+        checked += 1
+
+    check_late_segment()
+    print(f"Parity OK on {checked} calls")
+
+
+def time_it(func, call_data, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(call_data)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    check_parity()
+
+    for n_segments in (100, 1000, 5000):
+        call_data = random_call(n_segments, seed=n_segments, max_gap=1.0)
+        sweep = time_it(detect_overlaps, call_data)
+        pairwise = time_it(detect_overlaps_pairwise, call_data)
+        streaming = time_it(
+            lambda d: detect_overlaps_streaming(d, float("inf")), call_data
+        )
+        columnar = time_it(detect_overlaps, Transcript.from_dicts(call_data))
+        print(
+            f"{n_segments:>6} segments: streaming {streaming * 1000:8.2f} ms, sweep {sweep * 1000:8.2f} ms, "
+            f"transcript {columnar * 1000:8.2f} ms, "
+            f"pairwise {pairwise * 1000:8.2f} ms ({pairwise / sweep:.1f}x)"
+        )
@@ -0,0 +1,74 @@
+"""Cold-start benchmark: module import time and first dashboard render.
+
+Every measurement runs in a fresh interpreter so nothing is already imported.
+
+Run from the repository root:
+    python benchmarks/bench_startup.py [runs]
+"""
+
+import os
+import sys
+import json
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+# Import streamlit first so only the app's own imports and first render are timed
+FIRST_RENDER_SNIPPET = """
+import time
+from streamlit.testing.v1 import AppTest
+start = time.perf_counter()
+AppTest.from_file("app.py", default_timeout=120).run()
+print(time.perf_counter() - start)
+"""
+
+HEAVY_MODULES = ["sklearn", "profanity_check", "groq", "pandas", "plotly", "pyarrow"]
+
+LOADED_SNIPPET = """
+import sys, json
+import {module}
+print(json.dumps([name for name in {heavy} if name in sys.modules]))
+"""
+
+
+def run_snippet(snippet):
+    output = subprocess.run(
+        [sys.executable, "-c", snippet],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return output.strip().splitlines()[-1]
+
+
+def median_seconds(snippet, runs):
+    return statistics.median(float(run_snippet(snippet)) for _ in range(runs))
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    for module in ["overlap", "profanity", "privacy"]:
+        seconds = median_seconds(IMPORT_SNIPPET.format(module=module), runs)
+        loaded = json.loads(
+            run_snippet(LOADED_SNIPPET.format(module=module, heavy=HEAVY_MODULES))
+        )
+        print(
+            f"import {module:<10} {seconds * 1000:8.1f} ms  "
+            f"heavy deps loaded: {', '.join(loaded) or 'none'}"
+        )
+
+    try:
+        seconds = median_seconds(FIRST_RENDER_SNIPPET, runs)
+        print(f"app first render   {seconds * 1000:8.1f} ms")
+    except subprocess.CalledProcessError as e:
+        print(f"app first render   skipped ({e.stderr.strip().splitlines()[-1]})")
@@ -0,0 +1,186 @@
+"""Throughput and peak-memory benchmarks for the CPU hot paths.
+
+Each function runs over synthetic corpora (see synthetic.py) of several
+sizes, counted in transcript segments. Throughput is the best of --repeat
+timed runs; peak memory is the tracemalloc peak of one separate run, so
+tracing never slows the timed runs.
+
+Run from the repository root:
+    python benchmarks/bench_suite.py                  # report only
+    python benchmarks/bench_suite.py --check          # fail on regressions
+    python benchmarks/bench_suite.py --save-baseline  # record a new baseline
+
+--check fails when a throughput falls more than --tolerance (default 25%)
+below benchmarks/baseline.json. Baselines are machine specific: record one
+on the machine that runs the check.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import generate_corpus, write_corpus  # noqa: E402
+from overlap import detect_overlaps  # noqa: E402
+from privacy import PrivacyComplianceDetector  # noqa: E402
+from profanity import english_profanity_checker, process_file  # noqa: E402
+
+BASELINE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "baseline.json"
+)
+
+SEGMENTS_PER_CALL = 50
+
+
+def transcripts(n_segments):
+    n_calls = max(1, n_segments // SEGMENTS_PER_CALL)
+    return [
+        record["transcript"]
+        for record in generate_corpus(n_calls, SEGMENTS_PER_CALL, seed=n_segments)
+    ]
+
+
+def run_overlaps(calls):
+    for call in calls:
+        detect_overlaps(call)
+
+
+def run_profanity_checker(calls):
+    for call in calls:
+        for entry in call:
+            english_profanity_checker(entry["text"])
+
+
+def run_process_file(paths):
+    for path in paths:
+        process_file(path)
+
+
+def run_format_transcript(calls):
+    for call in calls:
+        PrivacyComplianceDetector.format_transcript(call)
+
+
+class FileCorpus:
+    """Synthetic corpus written to a temporary directory for process_file"""
+
+    def __init__(self, n_segments):
+        self.directory = tempfile.mkdtemp(prefix="bench_suite_")
+        n_calls = max(1, n_segments // SEGMENTS_PER_CALL)
+        self.paths = write_corpus(
+            self.directory, n_calls, SEGMENTS_PER_CALL, seed=n_segments
+        )
+
+    def close(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+# name -> (build workload for a segment count, run it)
+CASES = {
+    "detect_overlaps": (transcripts, run_overlaps),
+    "english_profanity_checker": (transcripts, run_profanity_checker),
+    "process_file": (FileCorpus, lambda corpus: run_process_file(corpus.paths)),
+    "format_transcript": (transcripts, run_format_transcript),
+}
+
+
+def measure(run, workload, n_segments, repeat):
+    """(segments per second, peak traced memory in KiB)"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(workload)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    run(workload)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return n_segments / best, peak / 2**10
+
+
+def run_suite(names, sizes, repeat):
+    # Load the wordlist and ML model before anything is timed
+    english_profanity_checker("warm up")
+
+    results = {}
+    for name in names:
+        build, run = CASES[name]
+        results[name] = {}
+        for n_segments in sizes:
+            workload = build(n_segments)
+            try:
+                throughput, peak_kib = measure(run, workload, n_segments, repeat)
+            finally:
+                if hasattr(workload, "close"):
+                    workload.close()
+            results[name][str(n_segments)] = {
+                "segments_per_second": throughput,
+                "peak_kib": peak_kib,
+            }
+            print(
+                f"{name:27s} {n_segments:>8d} segments "
+                f"{throughput:>12.0f} segments/s {peak_kib:>9.2f} KiB peak"
+            )
+    return results
+
+
+def regressions(results, baseline, tolerance):
+    """Entries whose throughput fell more than tolerance below the baseline"""
+    failures = []
+    for name, sizes in results.items():
+        for size, result in sizes.items():
+            expected = baseline.get(name, {}).get(size)
+            if expected is None:
+                continue
+            floor = expected["segments_per_second"] * (1 - tolerance)
+            if result["segments_per_second"] < floor:
+                failures.append(
+                    f"{name} @ {size}: {result['segments_per_second']:.0f} segments/s, "
+                    f"baseline {expected['segments_per_second']:.0f} "
+                    f"(floor {floor:.0f})"
+                )
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--only", nargs="*", choices=sorted(CASES), default=None)
+    parser.add_argument("--sizes", nargs="*", type=int, default=[500, 5000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--check", action="store_true")
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    results = run_suite(args.only or list(CASES), args.sizes, args.repeat)
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+        for name, sizes in results.items():
+            baseline.setdefault(name, {}).update(sizes)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline saved to {args.baseline}")
+
+    if args.check:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        failures = regressions(results, baseline, args.tolerance)
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        if failures:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} of the baseline")
@@ -0,0 +1,134 @@
+"""Parity check and timing for the vectorized corpus temporal engine.
+
+temporal.corpus_overlaps must return exactly the overlaps of
+overlap.detect_overlaps for every call, and call_stats/overlap_bins must
+match per-call Python reference computations. Timing compares the engine
+with the per-call loop the temporal notebook runs (detect_overlaps plus
+pd.cut binning for each file).
+
+Run from the repository root:
+    python benchmarks/bench_temporal.py [n_calls]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+from bench_overlap import random_call  # noqa: E402
+from synthetic import generate_corpus  # noqa: E402
+from overlap import detect_overlaps  # noqa: E402
+from temporal import CorpusArrays, analyze_corpus, corpus_overlaps  # noqa: E402
+from transcripts import iter_directory_records  # noqa: E402
+
+
+def reference_bins(overlaps, call_end, interval=5):
+    n_bins = max(int(np.ceil(call_end / interval)), 1)
+    counts = [0] * n_bins
+    for o in overlaps:
+        counts[min(int(o["overlap_start"] // interval), n_bins - 1)] += 1
+    return counts
+
+
+def check_parity(records):
+    result = analyze_corpus(records)
+    overlaps = result["overlaps"].drop(columns="file_id").to_dict("records")
+    calls = result["calls"].set_index("call_id")
+    bins = result["bins"].groupby("call_id", sort=False)["overlap_count"].apply(list)
+
+    position = 0
+    for record in records:
+        expected = detect_overlaps(record["transcript"])
+        got = overlaps[position : position + len(expected)]
+        position += len(expected)
+        assert got == expected, f"overlaps differ for {record['call_id']}"
+
+        stats = calls.loc[record["call_id"]]
+        assert stats["total_overlaps"] == len(expected)
+        assert np.isclose(
+            stats["total_overlap_duration"],
+            sum(o["overlap_duration"] for o in expected),
+        )
+        agent_talk = sum(
+            max(0, e["etime"] - e["stime"])
+            for e in record["transcript"]
+            if e["speaker"].lower() == "agent"
+        )
+        assert np.isclose(stats["agent_talk_time"], agent_talk)
+        if record["transcript"]:
+            call_end = max(e["etime"] for e in record["transcript"])
+            assert bins[record["call_id"]] == reference_bins(expected, call_end)
+    assert position == len(overlaps)
+
+
+def notebook_loop(records, interval=5):
+    """What the notebook's process_directory computes per file, minus the plots"""
+    stats = []
+    for record in records:
+        overlaps = detect_overlaps(record["transcript"])
+        df = pd.DataFrame(overlaps)
+        if not df.empty:
+            call_end = max(e["etime"] for e in record["transcript"])
+            bins = list(range(0, int(call_end) + interval, interval))
+            df["time_bin"] = pd.cut(df["overlap_start"], bins=bins, right=False)
+            df.groupby("time_bin", observed=False).size()
+            df["initiator"].value_counts()
+        stats.append(
+            {
+                "file": record["call_id"],
+                "total_overlaps": len(overlaps),
+                "total_overlap_duration": sum(o["overlap_duration"] for o in overlaps),
+            }
+        )
+    return pd.DataFrame(stats)
+
+
+if __name__ == "__main__":
+    n_calls = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    recorded = list(iter_directory_records("All_Conversations"))
+    randomized = [
+        {"call_id": f"random-{seed}", "transcript": random_call(60, seed)}
+        for seed in range(300)
+    ]
+    check_parity(recorded)
+    check_parity(randomized)
+    check_parity(list(generate_corpus(200, 80, overlap_density=0.4)))
+
+    # A call ending on a bin edge gets no trailing empty bin, like pd.cut
+    edge = [
+        {"speaker": "Agent", "text": "", "stime": 0, "etime": 6},
+        {"speaker": "Customer", "text": "", "stime": 5, "etime": 10},
+    ]
+    bins = analyze_corpus([{"call_id": "edge", "transcript": edge}])["bins"]
+    assert bins["overlap_count"].tolist() == [0, 1]
+    print(f"Parity OK on {len(recorded) + len(randomized) + 200} calls")
+
+    records = list(generate_corpus(n_calls, 60, overlap_density=0.2))
+    n_segments = sum(len(r["transcript"]) for r in records)
+
+    start = time.perf_counter()
+    notebook_loop(records)
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    corpus = CorpusArrays.from_records(records)
+    load_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    result = analyze_corpus(records)
+    engine_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    corpus_overlaps(corpus)
+    overlaps_seconds = time.perf_counter() - start
+
+    print(f"{n_calls} calls, {n_segments} segments, {len(result['overlaps'])} overlaps")
+    print(f"per-call loop   : {loop_seconds * 1000:9.1f} ms")
+    print(
+        f"vectorized      : {engine_seconds * 1000:9.1f} ms "
+        f"({loop_seconds / engine_seconds:.0f}x; load {load_seconds * 1000:.1f} ms, "
+        f"overlaps alone {overlaps_seconds * 1000:.1f} ms)"
+    )
@@ -0,0 +1,92 @@
+"""Offline evaluation of transcript compaction for the compliance prompt.
+
+For every call in compliance_violations.csv, the transcript is formatted
+both ways and the estimated prompt tokens are compared. With a Groq API key
+(or --base-url pointing at a compatible server), each call is also
+re-analyzed from the compacted transcript and its verdict compared with the
+stored one on is_violation, verification_performed and sensitive_info_shared.
+
+Run from the repository root:
+    python benchmarks/eval_compaction.py [--window N] [--tokens-only]
+"""
+
+import os
+import sys
+import json
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+from compaction import compact_transcript, count_tokens  # noqa: E402
+from privacy import PrivacyComplianceDetector  # noqa: E402
+
+VERDICT_FIELDS = ["is_violation", "verification_performed", "sensitive_info_shared"]
+
+
+def as_bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() == "true"
+    return bool(value)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--verdicts", default="compliance_violations.csv")
+    parser.add_argument("--conversations", default="All_Conversations")
+    parser.add_argument("--window", type=int, default=None)
+    parser.add_argument("--base-url", default=None)
+    parser.add_argument("--tokens-only", action="store_true")
+    args = parser.parse_args()
+
+    expected = pd.read_csv(args.verdicts).to_dict("records")
+    transcripts = {}
+    for row in expected:
+        path = os.path.join(args.conversations, row["call_id"])
+        with open(path, "r", encoding="utf-8") as f:
+            transcripts[row["call_id"]] = json.load(f)
+
+    # format_transcript does not touch the client, so no key is needed for this part
+    original_tokens = compacted_tokens = 0
+    for call_id, transcript in transcripts.items():
+        original = count_tokens(PrivacyComplianceDetector.format_transcript(transcript))
+        compacted = count_tokens(compact_transcript(transcript, window=args.window))
+        original_tokens += original
+        compacted_tokens += compacted
+        print(f"{call_id}: {original} -> {compacted} transcript tokens")
+
+    saved = original_tokens - compacted_tokens
+    print(
+        f"Transcript tokens: {original_tokens} -> {compacted_tokens} "
+        f"({saved} saved, {saved / original_tokens:.1%})"
+    )
+
+    if args.tokens_only:
+        sys.exit(0)
+    if not (os.environ.get("GROQ_API_KEY") or args.base_url):
+        print("No GROQ_API_KEY or --base-url; skipping the verdict comparison")
+        sys.exit(0)
+
+    detector = PrivacyComplianceDetector(
+        api_key=os.environ.get("GROQ_API_KEY", "local"),
+        base_url=args.base_url,
+        compact=True,
+        compact_window=args.window,
+        cache=False,
+    )
+    changed = 0
+    for row in expected:
+        result = detector.analyze_call_transcript(
+            row["call_id"], transcripts[row["call_id"]]
+        )
+        diffs = [
+            field
+            for field in VERDICT_FIELDS
+            if as_bool(result.get(field)) != as_bool(row[field])
+        ]
+        if "error" in result or diffs:
+            changed += 1
+            print(f"{row['call_id']}: changed {diffs or result.get('error')}")
+
+    print(f"{len(expected) - changed}/{len(expected)} verdicts unchanged")
+    sys.exit(1 if changed else 0)
@@ -0,0 +1,70 @@
+"""Offline evaluation of the rule-based compliance triage.
+
+Reports the share of calls in All_Conversations that triage answers without
+an LLM request, and checks every call it skips against the LLM verdicts in
+compliance_violations.csv: a skipped call must not be a violation or have
+sensitive information shared there.
+
+Run from the repository root:
+    python benchmarks/eval_triage.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+from triage import TriageCounter, triage_call  # noqa: E402
+from transcripts import iter_directory_records  # noqa: E402
+
+
+def as_bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() == "true"
+    return bool(value)
+
+
+if __name__ == "__main__":
+    conversations = sys.argv[1] if len(sys.argv) > 1 else "All_Conversations"
+    expected = {
+        row["call_id"]: row
+        for row in pd.read_csv("compliance_violations.csv").to_dict("records")
+    }
+
+    counter = TriageCounter()
+    decisions = {}
+    start = time.perf_counter()
+    for record in iter_directory_records(conversations):
+        triage = triage_call(record["transcript"])
+        counter.record(triage["decision"])
+        decisions[record["call_id"]] = triage
+    elapsed = time.perf_counter() - start
+
+    stats = counter.stats()
+    print(
+        f"{stats['skipped']}/{stats['calls']} calls skipped ({stats['skip_rate']:.1%}), "
+        f"{stats['escalated']} escalated, {stats['calls'] / elapsed:.0f} calls/s"
+    )
+
+    missed = []
+    for call_id, row in expected.items():
+        triage = decisions.get(call_id)
+        if triage is None:
+            continue
+        skipped = triage["decision"] == "skip"
+        if skipped and (
+            as_bool(row["is_violation"]) or as_bool(row["sensitive_info_shared"])
+        ):
+            missed.append(call_id)
+        print(
+            f"{call_id}: {triage['decision']:8s} "
+            f"(LLM sensitive_info_shared={as_bool(row['sensitive_info_shared'])}, "
+            f"verification_first={triage['verification_first']})"
+        )
+
+    if missed:
+        print(f"Triage skipped {len(missed)} calls the LLM flagged: {missed}")
+        sys.exit(1)
+    print("No skipped call was flagged by the LLM")
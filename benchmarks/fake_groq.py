@@ -0,0 +1,330 @@
+"""Local stand-in for the Groq chat-completions API, for offline load tests.
+
+Serves POST /openai/v1/chat/completions with Groq's response shape
+(choices, usage), so the real groq client, PrivacyComplianceDetector and
+check_profanity_with_llm run unmodified against it:
+
+    python benchmarks/fake_groq.py --port 8400 --latency lognormal:-1.5,0.5 --rpm 600
+    GROQ_BASE_URL=http://127.0.0.1:8400 GROQ_API_KEY=local \
+        LLM_CACHE_PATH=/tmp/fake_llm_cache.sqlite python transcripts.py ...
+
+Keep fake verdicts out of the shared LLM cache: from code, pass cache=False
+to PrivacyComplianceDetector and check_profanity_with_llm(_batch), as
+load_compliance.py does; from the command line, point LLM_CACHE_PATH at a
+scratch file as above. (LLM_CACHE_BYPASS=1 is not enough: it skips reads
+but still writes.) Cache keys include the endpoint, so fake entries are
+never served for the real API, but they still take up space in the cache.
+
+Verdicts are rule-generated: compliance prompts are answered from the
+local triage rules, profanity prompts from the lexical engine. With
+--canned, compliance verdicts for known call_ids come from a CSV
+(e.g. compliance_violations.csv) or JSONL file instead.
+
+Failure injection:
+    --latency    fixed:S | uniform:LO,HI | normal:MEAN,SD | lognormal:MU,SIGMA (seconds)
+    --rpm        server-side requests per minute; excess requests get a 429
+    --error-rate fraction of requests answered with a random 429 or 500
+    --malformed-rate fraction of completions whose content is not valid JSON
+"""
+
+import os
+import re
+import sys
+import csv
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ratelimit import TokenBucket, estimate_tokens  # noqa: E402
+from triage import triage_call, skipped_verdict  # noqa: E402
+
+COMPLETIONS_PATH = "/openai/v1/chat/completions"
+
+TRANSCRIPT_RE = re.compile(
+    r"CALL TRANSCRIPT \(ID: (?P<call_id>.*?)\):\n(?P<body>.*?)\n\nProvide your analysis",
+    re.DOTALL,
+)
+TURN_RE = re.compile(r"^(?P<speaker>[^\[:\n]+?)(?: \[[^\]]*\])?: (?P<text>.*)$")
+SINGLE_TEXT_RE = re.compile(
+    r'offensive language: "(?P<text>.*)"\n\nIf profanity', re.DOTALL
+)
+BATCH_TEXTS_RE = re.compile(
+    r"offensive language:\n(?P<items>\[.*?\])\n\nReturn a JSON object", re.DOTALL
+)
+
+
+def parse_latency(spec):
+    """Turn a --latency spec into a function returning a delay in seconds"""
+    kind, _, params = spec.partition(":")
+    values = [float(v) for v in params.split(",")] if params else []
+    if kind == "fixed":
+        return lambda rng: values[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+    if kind == "lognormal":
+        return lambda rng: rng.lognormvariate(values[0], values[1])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+def load_canned(path):
+    """call_id -> verdict from a compliance CSV report or a JSONL checkpoint"""
+    canned = {}
+    with open(path, "r", encoding="utf-8") as f:
+        rows = csv.DictReader(f) if path.endswith(".csv") else map(json.loads, f)
+        for row in rows:
+            verdict = {k: v for k, v in row.items() if k != "call_id" and v != ""}
+            for field in (
+                "verification_performed",
+                "sensitive_info_shared",
+                "is_violation",
+            ):
+                if isinstance(verdict.get(field), str):
+                    verdict[field] = verdict[field].strip().lower() == "true"
+            canned[row["call_id"]] = verdict
+    return canned
+
+
+def compliance_verdict(call_id, body):
+    """Rule-generated verdict from the transcript text in the prompt"""
+    transcript = []
+    for line in body.splitlines():
+        match = TURN_RE.match(line)
+        if match:
+            transcript.append(match.groupdict())
+
+    triage = triage_call(transcript)
+    if triage["decision"] == "skip":
+        verdict = skipped_verdict(call_id, triage)
+        del verdict["call_id"], verdict["triage"]
+        return verdict
+
+    verified = bool(triage["verification_methods"])
+    return {
+        "verification_performed": verified,
+        "verification_method": (
+            "Multiple"
+            if len(triage["verification_methods"]) > 1
+            else (triage["verification_methods"] or ["None"])[0]
+        ),
+        "sensitive_info_shared": True,
+        "sensitive_info_type": "Account balance",
+        "is_violation": not triage["verification_first"],
+        "explanation": "Generated by the local fake Groq server.",
+    }
+
+
+def profanity_verdicts(texts):
+    from profanity import lexical_profanity_checker
+
+    results = []
+    for text in texts:
+        result = lexical_profanity_checker(text)
+        results.append(
+            {"detected": True, "terms": result[2]}
+            if result
+            else {"detected": False, "terms": []}
+        )
+    return results
+
+
+class FakeGroq:
+    """Request handling state shared by every server thread"""
+
+    def __init__(
+        self,
+        latency="fixed:0",
+        rpm=None,
+        error_rate=0.0,
+        malformed_rate=0.0,
+        canned=None,
+        seed=0,
+    ):
+        self.latency = parse_latency(latency)
+        self.bucket = TokenBucket(rpm) if rpm else None
+        self.error_rate = error_rate
+        self.malformed_rate = malformed_rate
+        self.canned = canned or {}
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counters = {
+            "requests": 0,
+            "completions": 0,
+            "rate_limited": 0,
+            "server_errors": 0,
+            "malformed": 0,
+        }
+
+    def count(self, name):
+        with self.lock:
+            self.counters[name] += 1
+
+    def draw(self):
+        """(delay, roll for errors, roll for malformed output)"""
+        with self.lock:
+            return self.latency(self.rng), self.rng.random(), self.rng.random()
+
+    def try_acquire(self):
+        """Take one request from the server-side bucket without blocking"""
+        return self.bucket is None or self.bucket.try_acquire()
+
+    def respond(self, request):
+        """(status, headers, body dict) for one chat-completions request"""
+        self.count("requests")
+        delay, error_roll, malformed_roll = self.draw()
+
+        if not self.try_acquire():
+            self.count("rate_limited")
+            return 429, {"retry-after": "1"}, _error("Rate limit reached", 429)
+        if error_roll < self.error_rate:
+            if error_roll < self.error_rate / 2:
+                self.count("rate_limited")
+                return 429, {"retry-after": "1"}, _error("Rate limit reached", 429)
+            self.count("server_errors")
+            return 500, {}, _error("Internal server error", 500)
+
+        time.sleep(delay)
+        messages = request.get("messages", [])
+        prompt = messages[-1]["content"] if messages else ""
+        content = json.dumps(self.complete(prompt))
+        if malformed_roll < self.malformed_rate:
+            self.count("malformed")
+            content = content[: len(content) // 2]
+
+        self.count("completions")
+        prompt_tokens = estimate_tokens(messages)
+        completion_tokens = len(content) // 4
+        return (
+            200,
+            {},
+            {
+                "id": f"chatcmpl-fake-{self.counters['requests']}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "fake"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                    "queue_time": 0.0,
+                    "total_time": delay,
+                },
+            },
+        )
+
+    def complete(self, prompt):
+        match = TRANSCRIPT_RE.search(prompt)
+        if match:
+            call_id = match.group("call_id")
+            if call_id in self.canned:
+                return self.canned[call_id]
+            return compliance_verdict(call_id, match.group("body"))
+
+        match = BATCH_TEXTS_RE.search(prompt)
+        if match:
+            items = json.loads(match.group("items"))
+            verdicts = profanity_verdicts([item["text"] for item in items])
+            return {
+                "results": [
+                    dict(verdict, index=item["index"])
+                    for item, verdict in zip(items, verdicts)
+                ]
+            }
+
+        match = SINGLE_TEXT_RE.search(prompt)
+        if match:
+            return profanity_verdicts([match.group("text")])[0]
+
+        return {"error": "unrecognized prompt"}
+
+
+def _error(message, status):
+    return {
+        "error": {
+            "message": message,
+            "type": "rate_limit_exceeded" if status == 429 else "server_error",
+        }
+    }
+
+
+def make_handler(fake):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            length = int(self.headers.get("content-length", 0))
+            payload = self.rfile.read(length)
+            if self.path.rstrip("/") != COMPLETIONS_PATH:
+                status, headers, body = 404, {}, _error("Not found", 404)
+            else:
+                try:
+                    status, headers, body = fake.respond(json.loads(payload))
+                except Exception as e:
+                    status, headers, body = 500, {}, _error(str(e), 500)
+
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("content-type", "application/json")
+            self.send_header("content-length", str(len(data)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def start_server(fake, host="127.0.0.1", port=0):
+    """Serve fake on a background thread; returns (server, base_url)"""
+    server = ThreadingHTTPServer((host, port), make_handler(fake))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Groq-compatible fake server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8400)
+    parser.add_argument("--latency", default="fixed:0")
+    parser.add_argument("--rpm", type=float, default=None)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--canned", help="Compliance verdicts to replay (CSV or JSONL)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    fake = FakeGroq(
+        latency=args.latency,
+        rpm=args.rpm,
+        error_rate=args.error_rate,
+        malformed_rate=args.malformed_rate,
+        canned=load_canned(args.canned) if args.canned else None,
+        seed=args.seed,
+    )
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(fake))
+    server.daemon_threads = True
+    print(f"Fake Groq listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(fake.counters))
@@ -0,0 +1,126 @@
+"""End-to-end load test of the LLM paths against the local fake Groq server.
+
+Runs the real PrivacyComplianceDetector (groq client, rate limiter,
+retries, JSON parsing) over recorded or synthetic calls at several
+concurrency levels and reports audit throughput, failed calls and what the
+server saw (429s, 500s, malformed completions). With --profanity the
+batched check_profanity_with_llm path is measured too.
+
+Run from the repository root:
+    python benchmarks/load_compliance.py --calls 200 --concurrency 1 8 32 \\
+        --latency lognormal:-1.2,0.4 --rpm 1200 --malformed-rate 0.01
+
+Pass --base-url to target an already running fake_groq.py (or another
+compatible endpoint) instead of the in-process server.
+"""
+
+import os
+import sys
+import time
+import argparse
+import itertools
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_groq import FakeGroq, load_canned, start_server  # noqa: E402
+from synthetic import generate_corpus  # noqa: E402
+from transcripts import iter_directory_records  # noqa: E402
+
+
+def load_records(n_calls, synthetic, segments):
+    if synthetic:
+        return list(generate_corpus(n_calls, segments))
+    recorded = list(iter_directory_records("All_Conversations"))
+    return list(itertools.islice(itertools.cycle(recorded), n_calls))
+
+
+def run_compliance(base_url, records, concurrency, canned):
+    from privacy import PrivacyComplianceDetector
+
+    detector = PrivacyComplianceDetector(
+        api_key="local", base_url=base_url, cache=False
+    )
+    start = time.perf_counter()
+    results = list(detector.iter_analyses(records, max_concurrency=concurrency))
+    elapsed = time.perf_counter() - start
+
+    failed = sum("error" in result for result in results)
+    mismatched = sum(
+        result.get("is_violation") != canned[result["call_id"]].get("is_violation")
+        for result in results
+        if result["call_id"] in canned and "error" not in result
+    )
+    return len(results) / elapsed, failed, mismatched
+
+
+def run_profanity(base_url, records, chunk_size):
+    os.environ["GROQ_BASE_URL"] = base_url
+    from profanity import check_profanity_with_llm_batch
+
+    texts = [entry["text"] for record in records for entry in record["transcript"]]
+    start = time.perf_counter()
+    check_profanity_with_llm_batch(
+        texts, api_key="local", cache=False, chunk_size=chunk_size
+    )
+    return len(texts) / (time.perf_counter() - start), len(texts)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default=None)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--synthetic", action="store_true")
+    parser.add_argument("--segments", type=int, default=30)
+    parser.add_argument("--concurrency", nargs="*", type=int, default=[1, 8, 32])
+    parser.add_argument("--latency", default="lognormal:-1.2,0.4")
+    parser.add_argument("--rpm", type=float, default=None)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--canned", default=None)
+    parser.add_argument("--profanity", action="store_true")
+    parser.add_argument("--chunk-size", type=int, default=25)
+    args = parser.parse_args()
+
+    canned = load_canned(args.canned) if args.canned else {}
+    fake = None
+    base_url = args.base_url
+    if base_url is None:
+        fake = FakeGroq(
+            latency=args.latency,
+            rpm=args.rpm,
+            error_rate=args.error_rate,
+            malformed_rate=args.malformed_rate,
+            canned=canned,
+        )
+        server, base_url = start_server(fake)
+        print(f"Fake Groq on {base_url} (latency {args.latency})")
+
+    records = load_records(args.calls, args.synthetic, args.segments)
+    for concurrency in args.concurrency:
+        before = dict(fake.counters) if fake else {}
+        calls_per_second, failed, mismatched = run_compliance(
+            base_url, records, concurrency, canned
+        )
+        line = (
+            f"compliance  concurrency {concurrency:>3d}: {calls_per_second:8.1f} calls/s, "
+            f"{failed} failed"
+        )
+        if canned:
+            line += f", {mismatched} verdicts differ from --canned"
+        if fake:
+            seen = {k: fake.counters[k] - before.get(k, 0) for k in fake.counters}
+            line += (
+                f" | server: {seen['requests']} requests, {seen['rate_limited']} 429, "
+                f"{seen['server_errors']} 500, {seen['malformed']} malformed"
+            )
+        print(line)
+
+    if args.profanity:
+        utterances_per_second, n_texts = run_profanity(
+            base_url, records, args.chunk_size
+        )
+        print(
+            f"profanity   {n_texts} utterances in chunks of {args.chunk_size}: "
+            f"{utterances_per_second:8.1f} utterances/s"
+        )
@@ -0,0 +1,160 @@
+"""Synthetic call transcripts for benchmarks and load tests.
+
+Calls follow the shape of All_Conversations (speaker, text, stime, etime)
+with a configurable length, speaker mix, overlap density and profanity rate,
+and are reproducible from a seed.
+
+    python benchmarks/synthetic.py OUTPUT_DIR --calls 100 --segments 50
+"""
+
+import os
+import json
+import random
+import argparse
+
+AGENT_LINES = [
+    "Hello, this is {name} from XYZ Collections. How are you today?",
+    "I'm calling regarding an outstanding balance on your account.",
+    "Before we proceed, can you please verify your date of birth?",
+    "Thank you. Can you also confirm your current address?",
+    "You currently have a balance of ${amount}. How would you like to proceed?",
+    "We can set up a payment plan of ${amount} a month if that helps.",
+    "I understand. Let me note that on your account.",
+    "Is there anything else I can help you with today?",
+    "Thank you for your time. Have a great day!",
+]
+
+CUSTOMER_LINES = [
+    "Hi, yes, this is {name}. What is this about?",
+    "Sure, it's January {day}, 19{year}.",
+    "It's {number} Maple Street, Springfield.",
+    "I didn't know I still owed anything on that account.",
+    "I can pay part of it today and the rest next week.",
+    "Can you send me the details by email?",
+    "I think you have the wrong number.",
+    "Please add me to your do not call list.",
+    "Okay, thank you.",
+]
+
+PROFANE_INSERTS = [
+    "What the hell is this about?",
+    "This is such bullshit.",
+    "Stop calling me, damn it.",
+    "Are you fucking kidding me?",
+    "You people are a bunch of bastards.",
+    "I don't give a sh*t about your records.",
+]
+
+NAMES = ["Mark", "Sarah", "Lisa", "John", "Emma", "Mike", "Jessica"]
+
+
+def _line(rng, templates):
+    return rng.choice(templates).format(
+        name=rng.choice(NAMES),
+        amount=rng.randint(50, 5000),
+        day=rng.randint(1, 28),
+        year=rng.randint(40, 99),
+        number=rng.randint(1, 999),
+    )
+
+
+def generate_call(
+    n_segments=50,
+    agent_share=0.5,
+    overlap_density=0.1,
+    profanity_rate=0.02,
+    extra_speakers=(),
+    seed=None,
+):
+    """
+    Generate one call transcript.
+
+    Args:
+        n_segments (int): Number of segments
+        agent_share (float): Probability that a segment is spoken by the Agent
+            (the rest are the Customer, or one of extra_speakers)
+        overlap_density (float): Probability that a segment starts before the
+            previous one ends
+        profanity_rate (float): Probability that a segment is a profane line
+        extra_speakers (tuple): Other speaker names, e.g. ("Supervisor",)
+        seed (int, optional): Random seed
+
+    Returns:
+        list: Transcript entries with speaker, text, stime and etime
+    """
+    rng = random.Random(seed)
+    others = ["Customer", *extra_speakers]
+    call = []
+    t = 0.0
+    previous_end = 0.0
+    for _ in range(n_segments):
+        if rng.random() < agent_share:
+            speaker, templates = "Agent", AGENT_LINES
+        else:
+            speaker, templates = rng.choice(others), CUSTOMER_LINES
+
+        text = (
+            rng.choice(PROFANE_INSERTS)
+            if rng.random() < profanity_rate
+            else _line(rng, templates)
+        )
+        duration = round(max(1.0, len(text) / 15 + rng.uniform(-1, 1)), 1)
+
+        if call and rng.random() < overlap_density:
+            # Cut in before the previous segment finishes
+            stime = round(previous_end - rng.uniform(0.2, min(2.0, duration)), 1)
+        else:
+            stime = round(previous_end + rng.uniform(0, 1.5), 1)
+        stime = max(stime, round(t, 1))
+        etime = round(stime + duration, 1)
+
+        call.append({"speaker": speaker, "text": text, "stime": stime, "etime": etime})
+        t = stime
+        previous_end = max(previous_end, etime)
+    return call
+
+
+def generate_corpus(n_calls, n_segments=50, seed=0, **kwargs):
+    """Generate n_calls {call_id, transcript} records (see generate_call for kwargs)"""
+    for i in range(n_calls):
+        yield {
+            "call_id": f"synthetic-{seed}-{i:06d}.json",
+            "transcript": generate_call(
+                n_segments, seed=seed * 1_000_003 + i, **kwargs
+            ),
+        }
+
+
+def write_corpus(directory, n_calls, n_segments=50, seed=0, **kwargs):
+    """Write a synthetic corpus as one JSON file per call; returns the file paths"""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for record in generate_corpus(n_calls, n_segments, seed, **kwargs):
+        path = os.path.join(directory, record["call_id"])
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(record["transcript"], f)
+        paths.append(path)
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic transcript corpus")
+    parser.add_argument("output", help="Directory for the JSON transcripts")
+    parser.add_argument("--calls", type=int, default=100)
+    parser.add_argument("--segments", type=int, default=50)
+    parser.add_argument("--agent-share", type=float, default=0.5)
+    parser.add_argument("--overlap-density", type=float, default=0.1)
+    parser.add_argument("--profanity-rate", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    paths = write_corpus(
+        args.output,
+        args.calls,
+        args.segments,
+        seed=args.seed,
+        agent_share=args.agent_share,
+        overlap_density=args.overlap_density,
+        profanity_rate=args.profanity_rate,
+    )
+    print(f"Wrote {len(paths)} calls to {args.output}")
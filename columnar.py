@@ -0,0 +1,161 @@
+import os
+import json
+import uuid
+import datetime
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+PROFANITY_SCHEMA = pa.schema(
+    [
+        ("file_id", pa.string()),
+        ("timestamp_start", pa.float64()),
+        ("timestamp_end", pa.float64()),
+        ("speaker", pa.string()),
+        ("profane_term", pa.string()),
+        ("sentence", pa.string()),
+        ("detection_method", pa.string()),
+    ]
+)
+
+COMPLIANCE_SCHEMA = pa.schema(
+    [
+        ("call_id", pa.string()),
+        ("verification_performed", pa.bool_()),
+        ("verification_method", pa.string()),
+        ("sensitive_info_shared", pa.bool_()),
+        ("sensitive_info_type", pa.string()),
+        ("is_violation", pa.bool_()),
+        ("explanation", pa.string()),
+        ("triage", pa.string()),
+        ("transcript_tokens", pa.int64()),
+        ("tokens_saved", pa.int64()),
+        ("error", pa.string()),
+    ]
+)
+
+OVERLAP_SCHEMA = pa.schema(
+    [
+        ("file_id", pa.string()),
+        ("overlap_start", pa.float64()),
+        ("overlap_end", pa.float64()),
+        ("overlap_duration", pa.float64()),
+        ("agent_stime", pa.float64()),
+        ("agent_etime", pa.float64()),
+        ("customer_stime", pa.float64()),
+        ("customer_etime", pa.float64()),
+        ("initiator", pa.string()),
+    ]
+)
+
+SCHEMAS = {
+    "profanity": PROFANITY_SCHEMA,
+    "compliance": COMPLIANCE_SCHEMA,
+    "overlap": OVERLAP_SCHEMA,
+}
+
+
+def _coerce(value, arrow_type):
+    """Convert a loosely typed value (e.g. from an LLM verdict) to the column type"""
+    if value is None:
+        return None
+    if pa.types.is_boolean(arrow_type):
+        if isinstance(value, str):
+            return value.strip().lower() in ("true", "yes", "1")
+        return bool(value)
+    if pa.types.is_integer(arrow_type):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+    if pa.types.is_floating(arrow_type):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, default=str)
+
+
+def _record_batches(rows, schema, batch_size):
+    """Group row dicts into typed RecordBatches of at most batch_size rows"""
+    columns = {field.name: [] for field in schema}
+    for row in rows:
+        for field in schema:
+            columns[field.name].append(_coerce(row.get(field.name), field.type))
+        if len(columns[schema[0].name]) >= batch_size:
+            yield pa.RecordBatch.from_pydict(columns, schema=schema)
+            columns = {field.name: [] for field in schema}
+
+    if columns[schema[0].name]:
+        yield pa.RecordBatch.from_pydict(columns, schema=schema)
+
+
+def write_parquet(
+    rows,
+    root,
+    dataset,
+    partition_by=(),
+    run_date=None,
+    batch_size=65536,
+):
+    """
+    Stream result rows into a partitioned Parquet dataset.
+
+    Rows are converted to Arrow in batches of batch_size and written as they
+    arrive, so the full result set is never materialized. Files land under
+    root/<dataset>/run_date=<date>/[<column>=<value>/...], and each row group
+    carries min/max statistics so readers can skip data they do not need.
+
+    Args:
+        rows (iterable): Result dicts (profanity rows, compliance verdicts or overlaps)
+        root (str): Base directory of the results store
+        dataset (str): "profanity", "compliance" or "overlap"
+        partition_by (tuple): Extra partition columns, e.g. ("speaker",) or ("detection_method",)
+        run_date (str, optional): Partition date, defaults to today (YYYY-MM-DD)
+        batch_size (int): Rows per record batch and per row group
+
+    Returns:
+        int: Number of rows written
+    """
+    schema = SCHEMAS[dataset].append(pa.field("run_date", pa.string()))
+    run_date = run_date or datetime.date.today().isoformat()
+    partition_fields = [schema.field("run_date")] + [
+        schema.field(column) for column in partition_by
+    ]
+
+    counter = {"rows": 0}
+
+    def tagged_rows():
+        for row in rows:
+            counter["rows"] += 1
+            yield dict(row, run_date=run_date)
+
+    ds.write_dataset(
+        _record_batches(tagged_rows(), schema, batch_size),
+        os.path.join(root, dataset),
+        schema=schema,
+        format="parquet",
+        partitioning=ds.partitioning(pa.schema(partition_fields), flavor="hive"),
+        basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+        max_rows_per_group=batch_size,
+        file_options=ds.ParquetFileFormat().make_write_options(
+            compression="zstd", write_statistics=True
+        ),
+    )
+    return counter["rows"]
+
+
+def read_parquet(root, dataset, filter=None, columns=None):
+    """
+    Load a results dataset (or a filtered slice of it) as a pandas DataFrame.
+
+    Example:
+        read_parquet("results", "profanity", filter=ds.field("speaker") == "Agent")
+    """
+    dataset_path = os.path.join(root, dataset)
+    table = ds.dataset(dataset_path, format="parquet", partitioning="hive").to_table(
+        filter=filter, columns=columns
+    )
+    return table.to_pandas()
@@ -0,0 +1,111 @@
+import re
+from ratelimit import estimate_tokens
+from transcripts import Transcript
+
+# Turns that may carry identity verification or a sensitive disclosure; the
+# compliance verdict depends only on these and the turns around them
+VERIFICATION_CUES = re.compile(
+    r"\b(?:verif\w*|confirm\w*|date of birth|birth\s?date|born|d\.?o\.?b\b|"
+    r"address|zip|postal|social security|ssn|last (?:four|4)|identity)",
+    re.IGNORECASE,
+)
+DISCLOSURE_CUES = re.compile(
+    r"(?:\$\s?\d|\b\d[\d,]*(?:\.\d+)? dollars\b|\b(?:balance|owe[sd]?|owing|"
+    r"account (?:number|ending)|transaction\w*|credit limit|loan|payment\w*|"
+    r"debt|amount|due)\b)",
+    re.IGNORECASE,
+)
+
+
+def merge_turns(transcript_data):
+    """
+    Merge consecutive entries by the same speaker into one turn.
+    Returns (speaker, text, stime, etime) tuples in transcript order.
+    """
+    if isinstance(transcript_data, Transcript):
+        rows = transcript_data.rows()
+    else:
+        rows = (
+            (
+                entry.get("speaker", "Unknown"),
+                entry.get("text", ""),
+                entry.get("stime", ""),
+                entry.get("etime", ""),
+            )
+            for entry in transcript_data
+        )
+
+    turns = []
+    for speaker, text, stime, etime in rows:
+        text = str(text).strip()
+        if turns and turns[-1][0] == speaker:
+            previous = turns[-1]
+            turns[-1] = (speaker, f"{previous[1]} {text}".strip(), previous[2], etime)
+        else:
+            turns.append((speaker, text, stime, etime))
+    return turns
+
+
+def cue_window(turns, window):
+    """
+    Indices of the turns within `window` turns of a verification or disclosure
+    cue, or every index if no turn has a cue.
+    """
+    cues = [
+        i
+        for i, (_, text, _, _) in enumerate(turns)
+        if VERIFICATION_CUES.search(text) or DISCLOSURE_CUES.search(text)
+    ]
+    if not cues:
+        return list(range(len(turns)))
+
+    keep = set()
+    for i in cues:
+        keep.update(range(max(0, i - window), min(len(turns), i + window + 1)))
+    return sorted(keep)
+
+
+def compact_transcript(transcript_data, timestamps=False, window=None):
+    """
+    Format a transcript for the compliance prompt with as few tokens as possible.
+
+    Consecutive turns by the same speaker are merged and timestamps are
+    dropped (the verdict only needs the order of turns, which the line order
+    keeps). With window set, only turns within `window` turns of a
+    verification or disclosure cue are kept, and each gap is replaced by an
+    "[N turns omitted]" line so the model still sees that time passed.
+
+    Args:
+        transcript_data (list or Transcript): Entries with speaker, text, stime and etime
+        timestamps (bool): Keep each turn's start time, in whole seconds
+        window (int, optional): Turns of context to keep around each cue
+
+    Returns:
+        str: The compacted transcript text
+    """
+    turns = merge_turns(transcript_data)
+    indices = range(len(turns)) if window is None else cue_window(turns, window)
+
+    def omitted(count):
+        return f"[{count} turn{'s' if count > 1 else ''} omitted]"
+
+    lines = []
+    previous = -1
+    for i in indices:
+        if i - previous > 1:
+            lines.append(omitted(i - previous - 1))
+        speaker, text, stime, _ = turns[i]
+        if timestamps and isinstance(stime, (int, float)):
+            lines.append(f"{speaker} [{int(stime)}]: {text}")
+        else:
+            lines.append(f"{speaker}: {text}")
+        previous = i
+    if previous < len(turns) - 1:
+        lines.append(omitted(len(turns) - previous - 1))
+
+    return "\n".join(lines)
+
+
+def count_tokens(text):
+    """Estimated token count of a piece of prompt text"""
+    return estimate_tokens([{"content": text}])
@@ -0,0 +1,201 @@
+import os
+import json
+import argparse
+import pandas as pd
+from overlap import detect_overlaps
+from profanity import check_profanity_batch
+from transcripts import iter_records
+
+AGGREGATE_TABLES = ["calls", "profanity_by_agent", "violations_by_day"]
+
+CALL_COLUMNS = [
+    "call_id",
+    "agent_id",
+    "call_date",
+    "utterances",
+    "call_duration",
+    "agent_talk_time",
+    "customer_talk_time",
+    "overlaps",
+    "overlap_duration",
+    "overlap_ratio",
+    "profane_utterances",
+    "agent_profane_utterances",
+    "customer_profane_utterances",
+    "is_violation",
+]
+
+
+def call_summary(record, verdict=None):
+    """
+    Summarize one call into a single row of corpus metrics.
+
+    Profanity uses the regex, dictionary and ML stages only, and compliance
+    comes from an existing verdict, so no LLM request is made here.
+
+    Args:
+        record (dict): {"call_id", "transcript"} plus optional "agent_id" and "call_date"
+        verdict (dict, optional): Compliance result for this call
+
+    Returns:
+        dict: Per-call metrics
+    """
+    transcript = record.get("transcript", [])
+    speakers = [str(entry.get("speaker", "")).lower() for entry in transcript]
+    texts = [entry.get("text", "") for entry in transcript]
+    checks = check_profanity_batch(texts) if texts else []
+
+    talk_time = {"agent": 0.0, "customer": 0.0}
+    for speaker, entry in zip(speakers, transcript):
+        if speaker in talk_time:
+            talk_time[speaker] += max(0.0, entry["etime"] - entry["stime"])
+
+    if transcript:
+        call_duration = max(e["etime"] for e in transcript) - min(
+            e["stime"] for e in transcript
+        )
+    else:
+        call_duration = 0.0
+
+    overlaps = detect_overlaps(transcript)
+    overlap_duration = sum(o["overlap_duration"] for o in overlaps)
+    profane = [is_profane for is_profane, _, _ in checks]
+
+    summary = {
+        "call_id": record.get("call_id", "unknown"),
+        "agent_id": record.get("agent_id") or "unknown",
+        "call_date": record.get("call_date") or "unknown",
+        "utterances": len(transcript),
+        "call_duration": call_duration,
+        "agent_talk_time": talk_time["agent"],
+        "customer_talk_time": talk_time["customer"],
+        "overlaps": len(overlaps),
+        "overlap_duration": overlap_duration,
+        "overlap_ratio": overlap_duration / call_duration if call_duration else 0.0,
+        "profane_utterances": sum(profane),
+        "agent_profane_utterances": sum(
+            p for p, s in zip(profane, speakers) if s == "agent"
+        ),
+        "customer_profane_utterances": sum(
+            p for p, s in zip(profane, speakers) if s == "customer"
+        ),
+        "is_violation": None,
+    }
+    if verdict is not None:
+        is_violation = verdict.get("is_violation", False)
+        if isinstance(is_violation, str):
+            is_violation = is_violation.strip().lower() == "true"
+        summary["is_violation"] = bool(is_violation)
+    return summary
+
+
+def aggregate_tables(calls):
+    """
+    Build the fleet-level tables the dashboard charts from the per-call table.
+
+    Returns:
+        dict: table name -> DataFrame
+    """
+    profanity_by_agent = (
+        calls.groupby("agent_id")
+        .agg(
+            calls=("call_id", "count"),
+            utterances=("utterances", "sum"),
+            agent_profane_utterances=("agent_profane_utterances", "sum"),
+            calls_with_profanity=("profane_utterances", lambda s: int((s > 0).sum())),
+        )
+        .reset_index()
+    )
+    profanity_by_agent["profanity_rate"] = (
+        profanity_by_agent["calls_with_profanity"] / profanity_by_agent["calls"]
+    )
+
+    audited = calls[calls["is_violation"].notna()]
+    violations_by_day = (
+        audited.groupby("call_date")
+        .agg(
+            calls=("call_id", "count"),
+            violations=("is_violation", lambda s: int(s.astype(bool).sum())),
+        )
+        .reset_index()
+    )
+    violations_by_day["violation_rate"] = (
+        violations_by_day["violations"] / violations_by_day["calls"]
+    )
+
+    return {
+        "calls": calls,
+        "profanity_by_agent": profanity_by_agent,
+        "violations_by_day": violations_by_day,
+    }
+
+
+def load_verdicts(path):
+    """Read compliance results (CSV report or JSONL checkpoint) into call_id -> verdict"""
+    if path.endswith(".jsonl"):
+        verdicts = {}
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    result = json.loads(line)
+                    verdicts[result.get("call_id")] = result
+        return verdicts
+
+    df = pd.read_csv(path)
+    return {row["call_id"]: row for row in df.to_dict("records")}
+
+
+def build_aggregates(records, verdicts=None):
+    """
+    Compute every aggregate table from a stream of call records in one pass.
+
+    Args:
+        records (iterable): {"call_id", "transcript"} records, e.g. from transcripts.iter_records
+        verdicts (dict, optional): call_id -> compliance result
+
+    Returns:
+        dict: table name -> DataFrame
+    """
+    verdicts = verdicts or {}
+    rows = []
+    for record in records:
+        try:
+            rows.append(call_summary(record, verdicts.get(record.get("call_id"))))
+        except Exception as e:
+            print(f"Error summarizing {record.get('call_id')}: {e}")
+
+    calls = pd.DataFrame(rows, columns=CALL_COLUMNS)
+    return aggregate_tables(calls)
+
+
+def save_aggregates(tables, directory):
+    """Write each aggregate table to <directory>/<table>.parquet"""
+    os.makedirs(directory, exist_ok=True)
+    for name, table in tables.items():
+        table.to_parquet(os.path.join(directory, f"{name}.parquet"), index=False)
+
+
+def load_aggregates(directory):
+    """Load the aggregate tables written by save_aggregates"""
+    return {
+        name: pd.read_parquet(os.path.join(directory, f"{name}.parquet"))
+        for name in AGGREGATE_TABLES
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Precompute corpus-level aggregates for the dashboard"
+    )
+    parser.add_argument("input", help="JSONL export or directory of JSON transcripts")
+    parser.add_argument("output", help="Directory for the aggregate tables")
+    parser.add_argument(
+        "--compliance",
+        help="Compliance results to join (compliance_violations.csv or a JSONL checkpoint)",
+    )
+    args = parser.parse_args()
+
+    verdicts = load_verdicts(args.compliance) if args.compliance else None
+    tables = build_aggregates(iter_records(args.input), verdicts)
+    save_aggregates(tables, args.output)
+    print(f"Saved aggregates for {len(tables['calls'])} calls to {args.output}")
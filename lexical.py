@@ -0,0 +1,149 @@
+import re
+
+# Common English profanity patterns, including obfuscated spellings
+ENGLISH_REGEX_PATTERNS = [
+    r"\bf+[^\w]*u+[^\w]*c+[^\w]*k+\w*",
+    r"\bf+[^\w]*\*+[^\w]*c+[^\w]*k+\w*",
+    r"\bs+[^\w]*h+[^\w]*i+[^\w]*t+\w*",
+    r"\bs+[^\w]*\*+[^\w]*\*+[^\w]*t+\w*",
+    r"\bn+[^\w]*i+[^\w]*g+[^\w]*g+[^\w]*[^\w]*r+\w*",
+    r"\bb+[^\w]*i+[^\w]*t+[^\w]*c+[^\w]*h+\w*",
+    r"\ba+[^\w]*s+[^\w]*s+[^\w]*h+[^\w]*o+[^\w]*l+[^\w]*e+\w*",
+    r"\bp+[^\w]*[uo]+[^\w]*r+[^\w]*n+\w*",
+    r"\bp+[^\w]*e+[^\w]*n+[^\w]*i+[^\w]*s+\w*",
+]
+
+# Character substitutions better_profanity accepts for each letter
+CHARS_MAPPING = {
+    "a": ("a", "@", "*", "4"),
+    "i": ("i", "*", "l", "1"),
+    "o": ("o", "*", "0", "@"),
+    "u": ("u", "*", "v"),
+    "v": ("v", "*", "u"),
+    "l": ("l", "1"),
+    "e": ("e", "*", "3"),
+    "s": ("s", "$", "5"),
+    "t": ("t", "7"),
+}
+
+# Runs of characters better_profanity treats as part of a word
+_TOKEN_RE = re.compile(r"(?:[^\W_]|[@$*\"'])+")
+
+_WORD_END = None
+
+
+class LexicalProfanityEngine:
+    """
+    Precompiled regex and wordlist matcher for the lexical profanity stages.
+
+    The nine regex patterns are compiled once into a single alternation, and
+    the wordlist is compiled into a character trie. Text is tokenized in one
+    pass and each token start walks the trie, following every letter a
+    character may stand in for (e.g. "@" for "a" or "o") and crossing the
+    separators between tokens, so obfuscated spellings ("sh!t", "s-o-b") and
+    multi-word phrases are matched without re-scanning the text.
+    All hits are reported as exact (start, end) character spans.
+    """
+
+    def __init__(self, words, regex_patterns=ENGLISH_REGEX_PATTERNS):
+        self.regex = re.compile(
+            "|".join(f"(?:{pattern})" for pattern in regex_patterns), re.IGNORECASE
+        )
+
+        # Reverse of CHARS_MAPPING: text character -> letters it may stand in for
+        self._substitutes = {}
+        for letter, variants in CHARS_MAPPING.items():
+            for variant in variants:
+                self._substitutes.setdefault(variant, set()).add(letter)
+
+        self._trie = {}
+        for word in words:
+            self._add_word(" ".join(str(word).lower().split()))
+
+    def _add_word(self, word):
+        if not word:
+            return
+        node = self._trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[_WORD_END] = True
+
+    def _step(self, nodes, char):
+        next_nodes = []
+        for node in nodes:
+            child = node.get(char)
+            if child is not None:
+                next_nodes.append(child)
+            for letter in self._substitutes.get(char, ()):
+                if letter != char:
+                    child = node.get(letter)
+                    if child is not None:
+                        next_nodes.append(child)
+        return next_nodes
+
+    def regex_spans(self, text):
+        """Return (start, end) spans of every regex pattern hit in text order."""
+        return [match.span() for match in self.regex.finditer(text)]
+
+    def wordlist_spans(self, text):
+        """Return (start, end) spans of wordlist words and phrases in text order."""
+        tokens = [match.span() for match in _TOKEN_RE.finditer(text)]
+
+        spans = []
+        i = 0
+        while i < len(tokens):
+            nodes = [self._trie]
+            match_end = None
+            match_next = None
+            for j in range(i, len(tokens)):
+                start, end = tokens[j]
+                for char in text[start:end].lower():
+                    nodes = self._step(nodes, char)
+                    if not nodes:
+                        break
+                if not nodes:
+                    break
+                if any(_WORD_END in node for node in nodes):
+                    match_end = end
+                    match_next = j + 1
+
+                # Continue into the next token. Whitespace stands for the single
+                # space of a multi-word phrase; any other separator is matched
+                # literally, so entries like "sh!t", "s-o-b" or "p.u.s.s.y."
+                # are reached, and may end inside the separator
+                next_start = tokens[j + 1][0] if j + 1 < len(tokens) else len(text)
+                separator = text[end:next_start]
+                if separator.isspace():
+                    nodes = [node[" "] for node in nodes if " " in node]
+                else:
+                    for k, char in enumerate(separator.lower()):
+                        nodes = self._step(nodes, char)
+                        if not nodes:
+                            break
+                        if any(_WORD_END in node for node in nodes):
+                            match_end = end + k + 1
+                            match_next = j + 1
+                if not nodes:
+                    break
+
+            if match_end is not None:
+                spans.append((tokens[i][0], match_end))
+                i = match_next
+            else:
+                i += 1
+        return spans
+
+    def scan(self, text):
+        """
+        Run the regex stage, then the wordlist stage if the regex found nothing.
+        Returns (method, spans) where method is "regex", "dictionary" or None.
+        """
+        spans = self.regex_spans(text)
+        if spans:
+            return "regex", spans
+
+        spans = self.wordlist_spans(text)
+        if spans:
+            return "dictionary", spans
+
+        return None, []
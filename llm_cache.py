@@ -0,0 +1,139 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+# Used when LLM_CACHE_PATH is not set
+DEFAULT_CACHE_PATH = "llm_cache.sqlite"
+
+
+class LLMCache:
+    """
+    Persistent, content-addressed cache of LLM responses backed by SQLite.
+
+    Entries are keyed by a SHA-256 of the endpoint (the client's base URL)
+    and the full request (model, system and user prompts, sampling
+    parameters), so any change to the prompt or parameters is a different
+    entry, and responses from another endpoint, such as the fake server in
+    benchmarks/fake_groq.py, are never served for the real API. Expired
+    entries (ttl, in seconds) are dropped on read, and when max_entries is
+    set the least recently used entries are evicted on write. With
+    bypass=True reads always miss but responses are still written, which
+    refreshes the cache.
+    """
+
+    def __init__(
+        self, path=DEFAULT_CACHE_PATH, ttl=None, max_entries=None, bypass=False
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.bypass = bypass
+        self.hits = 0
+        self.misses = 0
+
+        # One connection shared by the detector's worker threads
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("""CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    created REAL NOT NULL,
+                    accessed REAL NOT NULL
+                )""")
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed)"
+            )
+
+    @staticmethod
+    def make_key(request, endpoint=""):
+        """Hash the endpoint and a chat-completions request dict into a cache key"""
+        payload = json.dumps(
+            {"endpoint": endpoint, "request": request},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, request, endpoint=""):
+        """Return the cached response text for request to endpoint, or None on a miss"""
+        if self.bypass:
+            self.misses += 1
+            return None
+
+        key = self.make_key(request, endpoint)
+        now = time.time()
+        with self.lock, self.conn:
+            row = self.conn.execute(
+                "SELECT response, created FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+                self.conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.conn.execute(
+                "UPDATE llm_cache SET accessed = ? WHERE key = ?", (now, key)
+            )
+            self.hits += 1
+            return row[0]
+
+    def set(self, request, response, endpoint=""):
+        """Store the response text for request to endpoint, evicting old entries"""
+        key = self.make_key(request, endpoint)
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, created, accessed) "
+                "VALUES (?, ?, ?, ?)",
+                (key, response, now, now),
+            )
+            if self.max_entries is not None:
+                self.conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache "
+                    "ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM llm_cache")
+
+    def stats(self):
+        """Hit/miss counters for this process and the number of stored entries"""
+        with self.lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+        }
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache():
+    """
+    Process-wide cache at LLM_CACHE_PATH; LLM_CACHE_BYPASS=1 skips reads.
+    Both are read on first use, after the callers' load_dotenv(), so values
+    from .env apply.
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = LLMCache(
+                os.environ.get("LLM_CACHE_PATH", DEFAULT_CACHE_PATH),
+                bypass=os.environ.get("LLM_CACHE_BYPASS", "") not in ("", "0"),
+            )
+        return _default_cache
@@ -0,0 +1,223 @@
+import os
+import json
+import time
+import threading
+
+# Upper bounds (seconds) of the latency histogram buckets
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class _NullTimer:
+    """Timer handed out while metrics are disabled; does nothing"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    def __init__(self, registry, name, labels):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.registry.observe(
+            self.name, time.perf_counter() - self.start, **self.labels
+        )
+        return False
+
+
+class MetricsRegistry:
+    """
+    In-process counters and histograms for the detection pipelines.
+
+    While disabled every call returns immediately, so instrumented code
+    costs one attribute check per call. Metric names follow Prometheus
+    conventions (counters end in _total, durations are in seconds) and are
+    exported as Prometheus text or as a JSON snapshot.
+    """
+
+    def __init__(self, enabled=False, buckets=DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+
+    def inc(self, name, value=1, **labels):
+        """Add value to a counter"""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        """Record one value (e.g. a duration in seconds) in a histogram"""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = {
+                    "buckets": [0] * len(self.buckets),
+                    "sum": 0.0,
+                    "count": 0,
+                }
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram["buckets"][i] += 1
+                    break
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    def timer(self, name, **labels):
+        """Context manager that observes its wall time in the histogram name"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, labels)
+
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def snapshot(self):
+        """All metrics as a JSON-serializable dict"""
+        with self.lock:
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(self.counters.items())
+            ]
+            histograms = [
+                {
+                    "name": name,
+                    "labels": dict(labels),
+                    "count": histogram["count"],
+                    "sum": histogram["sum"],
+                    "buckets": dict(zip(map(str, self.buckets), histogram["buckets"])),
+                }
+                for (name, labels), histogram in sorted(self.histograms.items())
+            ]
+        return {"counters": counters, "histograms": histograms}
+
+    def render_prometheus(self):
+        """All metrics in the Prometheus text exposition format"""
+
+        def label_text(labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ""
+            return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+        lines = []
+        typed = set()
+        with self.lock:
+            for (name, labels), value in sorted(self.counters.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {name} counter")
+                    typed.add(name)
+                lines.append(f"{name}{label_text(labels)} {value}")
+
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {name} histogram")
+                    typed.add(name)
+                cumulative = 0
+                for bound, count in zip(self.buckets, histogram["buckets"]):
+                    cumulative += count
+                    lines.append(
+                        f"{name}_bucket{label_text(labels, [('le', bound)])} {cumulative}"
+                    )
+                lines.append(
+                    f"{name}_bucket{label_text(labels, [('le', '+Inf')])} "
+                    f"{histogram['count']}"
+                )
+                lines.append(f"{name}_sum{label_text(labels)} {histogram['sum']}")
+                lines.append(f"{name}_count{label_text(labels)} {histogram['count']}")
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry; METRICS_ENABLED=1 turns it on at import
+REGISTRY = MetricsRegistry(
+    enabled=os.environ.get("METRICS_ENABLED", "") not in ("", "0")
+)
+
+
+def enable(enabled=True):
+    REGISTRY.enabled = enabled
+
+
+def inc(name, value=1, **labels):
+    REGISTRY.inc(name, value, **labels)
+
+
+def observe(name, value, **labels):
+    REGISTRY.observe(name, value, **labels)
+
+
+def timer(name, **labels):
+    return REGISTRY.timer(name, **labels)
+
+
+def record_llm_usage(api, response):
+    """Count prompt/completion tokens from a chat-completions response.usage"""
+    if not REGISTRY.enabled:
+        return
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    for kind in ("prompt_tokens", "completion_tokens"):
+        tokens = getattr(usage, kind, None)
+        if tokens:
+            REGISTRY.inc("llm_tokens_total", tokens, api=api, kind=kind)
+
+
+def write_snapshot(path, registry=REGISTRY):
+    """Write the JSON snapshot to path"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(registry.snapshot(), f, indent=2)
+
+
+def start_http_server(port, host="127.0.0.1", registry=REGISTRY):
+    """
+    Serve /metrics (Prometheus text) and /metrics.json on a background thread.
+    Returns the server; call shutdown() to stop it.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/metrics":
+                body = registry.render_prometheus().encode("utf-8")
+                content_type = "text/plain; version=0.0.4"
+            elif self.path == "/metrics.json":
+                body = json.dumps(registry.snapshot()).encode("utf-8")
+                content_type = "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("content-type", content_type)
+            self.send_header("content-length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
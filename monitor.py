@@ -0,0 +1,353 @@
+import sys
+import json
+import time
+import asyncio
+import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from profanity import (
+    get_lexical_engine,
+    predict_prob,
+    lexical_profanity_checker,
+    ml_profanity_checker_batch,
+    llm_profanity_checker_batch,
+)
+
+# Micro-batch window for utterances the regex and dictionary stages leave
+# unresolved: a batch is scored when it is full or its oldest item is this old
+MAX_BATCH_SIZE = 32
+MAX_BATCH_DELAY = 0.05
+
+# Number of recent latencies the p50/p99 figures are computed over
+LATENCY_WINDOW = 10000
+
+
+class LatencyTracker:
+    """Percentiles over a sliding window of the most recent latencies (seconds)."""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.samples = deque(maxlen=window)
+
+    def record(self, seconds):
+        self.samples.append(seconds)
+
+    def percentile(self, q):
+        """Nearest-rank percentile in milliseconds, or None before any sample"""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        rank = min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered))) - 1))
+        return ordered[rank] * 1000
+
+
+class ProfanityMonitor:
+    """
+    Long-running profanity monitor for live utterances.
+
+    Each utterance submitted goes through the regex and dictionary stages
+    inline. The ones they leave unresolved are queued and scored by the ML
+    model in micro-batches of up to max_batch_size, flushed at the latest
+    max_batch_delay seconds after the oldest queued utterance arrived; with
+    use_llm, the ML misses then go to the LLM in one batched request per
+    micro-batch. Flagged utterances are passed to on_event as they are found.
+
+    Latency is measured from submit() to the final verdict for every
+    utterance, flagged or not.
+    """
+
+    def __init__(
+        self,
+        on_event=None,
+        use_llm=False,
+        api_key=None,
+        max_batch_size=MAX_BATCH_SIZE,
+        max_batch_delay=MAX_BATCH_DELAY,
+        max_queue=10000,
+        max_llm_requests=4,
+    ):
+        self.on_event = on_event or (lambda event: None)
+        self.use_llm = use_llm
+        self.api_key = api_key
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay
+        self.max_queue = max_queue
+        self.max_llm_requests = max_llm_requests
+
+        self.latency = LatencyTracker()
+        self.counters = {
+            "received": 0,
+            "invalid": 0,
+            "flagged": 0,
+            "regex": 0,
+            "dictionary": 0,
+            "machine_learning": 0,
+            "llm": 0,
+            "batches": 0,
+            "batched_utterances": 0,
+        }
+
+        self._queue = None
+        self._batch_task = None
+        self._llm_tasks = set()
+        self._llm_slots = None
+        # One thread owns the ML model; LLM requests use their own pool
+        self._ml_executor = ThreadPoolExecutor(max_workers=1)
+        self._llm_executor = ThreadPoolExecutor(max_workers=max_llm_requests)
+
+    async def start(self):
+        """Load the wordlist and the ML model once, then start the batch worker"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._ml_executor, get_lexical_engine)
+        await loop.run_in_executor(self._ml_executor, predict_prob, [""])
+
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._llm_slots = asyncio.Semaphore(self.max_llm_requests)
+        self._batch_task = asyncio.create_task(self._batch_worker())
+
+    async def stop(self):
+        """Score everything still queued, then stop the batch worker"""
+        await self._queue.put(None)
+        await self._batch_task
+        if self._llm_tasks:
+            await asyncio.gather(*self._llm_tasks)
+        self._ml_executor.shutdown()
+        self._llm_executor.shutdown()
+
+    async def submit(self, utterance):
+        """
+        Check one utterance: {"call_id", "speaker", "text", "stime", "etime"}.
+        Waits only when the micro-batch queue is full (backpressure).
+        """
+        received = time.perf_counter()
+        self.counters["received"] += 1
+
+        text = utterance.get("text")
+        if not isinstance(text, str):
+            self.counters["invalid"] += 1
+            print(f"Error: utterance without text: {utterance}", file=sys.stderr)
+            return
+
+        # Stages 1 and 2 (regex, dictionary) are cheap enough to run inline
+        result = lexical_profanity_checker(text)
+        if result is not None:
+            self._publish(utterance, result, received)
+            return
+
+        await self._queue.put((received, utterance))
+
+    async def _batch_worker(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+
+            batch = [item]
+            deadline = item[0] + self.max_batch_delay
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                try:
+                    if timeout > 0:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    else:
+                        item = self._queue.get_nowait()
+                except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self.counters["batches"] += 1
+            self.counters["batched_utterances"] += len(batch)
+
+            # Stage 3: one predict_prob call for the whole micro-batch
+            texts = [utterance["text"] for _, utterance in batch]
+            ml_results = await loop.run_in_executor(
+                self._ml_executor, ml_profanity_checker_batch, texts
+            )
+
+            unresolved = []
+            for (received, utterance), result in zip(batch, ml_results):
+                if result is not None:
+                    self._publish(utterance, result, received)
+                elif self.use_llm:
+                    unresolved.append((received, utterance))
+                else:
+                    self.latency.record(time.perf_counter() - received)
+
+            # Stage 4 runs concurrently so slow LLM calls never hold up the ML batches
+            if unresolved:
+                await self._llm_slots.acquire()
+                task = asyncio.create_task(self._llm_stage(unresolved))
+                self._llm_tasks.add(task)
+                task.add_done_callback(self._llm_tasks.discard)
+
+    async def _llm_stage(self, batch):
+        loop = asyncio.get_running_loop()
+        try:
+            texts = [utterance["text"] for _, utterance in batch]
+            llm_results = await loop.run_in_executor(
+                self._llm_executor, llm_profanity_checker_batch, texts, self.api_key
+            )
+            for (received, utterance), result in zip(batch, llm_results):
+                if result is not None:
+                    self._publish(utterance, result, received)
+                else:
+                    self.latency.record(time.perf_counter() - received)
+        finally:
+            self._llm_slots.release()
+
+    def _publish(self, utterance, result, received):
+        latency = time.perf_counter() - received
+        self.latency.record(latency)
+
+        _, method, profane_terms = result
+        self.counters["flagged"] += 1
+        self.counters[method] += 1
+        self.on_event(
+            {
+                "call_id": utterance.get("call_id"),
+                "timestamp_start": utterance.get("stime"),
+                "timestamp_end": utterance.get("etime"),
+                "speaker": utterance.get("speaker"),
+                "profane_terms": profane_terms,
+                "sentence": utterance["text"],
+                "detection_method": method,
+                "latency_ms": latency * 1000,
+            }
+        )
+
+    def stats(self):
+        """Counters plus p50/p99 submit-to-verdict latency in milliseconds"""
+        batches = self.counters["batches"]
+        return dict(
+            self.counters,
+            mean_batch_size=(
+                self.counters["batched_utterances"] / batches if batches else 0.0
+            ),
+            p50_ms=self.latency.percentile(50),
+            p99_ms=self.latency.percentile(99),
+        )
+
+
+def _parse_line(line, monitor):
+    """Decode one NDJSON line, or report it and return None"""
+    if isinstance(line, bytes):
+        line = line.decode("utf-8", errors="replace")
+    if not line.strip():
+        return None
+    try:
+        utterance = json.loads(line)
+    except json.JSONDecodeError as e:
+        monitor.counters["invalid"] += 1
+        print(f"Error parsing line: {e}", file=sys.stderr)
+        return None
+    if not isinstance(utterance, dict):
+        monitor.counters["invalid"] += 1
+        print("Error parsing line: not a JSON object", file=sys.stderr)
+        return None
+    return utterance
+
+
+async def consume_stream(reader, monitor):
+    """Submit every NDJSON utterance read from an asyncio StreamReader"""
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        utterance = _parse_line(line, monitor)
+        if utterance is not None:
+            await monitor.submit(utterance)
+
+
+async def consume_stdin(monitor):
+    """Submit every NDJSON utterance read from stdin (pipe, file or terminal)"""
+    loop = asyncio.get_running_loop()
+    while True:
+        line = await loop.run_in_executor(None, sys.stdin.buffer.readline)
+        if not line:
+            break
+        utterance = _parse_line(line, monitor)
+        if utterance is not None:
+            await monitor.submit(utterance)
+
+
+async def report_stats(monitor, interval):
+    """Print a stats snapshot to stderr every interval seconds"""
+    while True:
+        await asyncio.sleep(interval)
+        print(json.dumps({"stats": monitor.stats()}), file=sys.stderr, flush=True)
+
+
+async def serve(args):
+    def write_event(event):
+        sys.stdout.write(json.dumps(event, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+
+    monitor = ProfanityMonitor(
+        on_event=write_event,
+        use_llm=args.use_llm,
+        max_batch_size=args.max_batch_size,
+        max_batch_delay=args.max_batch_delay_ms / 1000,
+    )
+    await monitor.start()
+    print("Models loaded, monitor ready", file=sys.stderr, flush=True)
+
+    reporter = None
+    if args.stats_interval:
+        reporter = asyncio.create_task(report_stats(monitor, args.stats_interval))
+
+    try:
+        if args.listen or args.unix:
+
+            async def handle_connection(reader, writer):
+                try:
+                    await consume_stream(reader, monitor)
+                finally:
+                    writer.close()
+
+            if args.unix:
+                server = await asyncio.start_unix_server(handle_connection, args.unix)
+            else:
+                host, _, port = args.listen.rpartition(":")
+                server = await asyncio.start_server(
+                    handle_connection, host or "127.0.0.1", int(port)
+                )
+            async with server:
+                await server.serve_forever()
+        else:
+            await consume_stdin(monitor)
+    finally:
+        if reporter is not None:
+            reporter.cancel()
+        await monitor.stop()
+        print(json.dumps({"stats": monitor.stats()}), file=sys.stderr, flush=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Stream NDJSON utterances through the profanity checker and "
+        "print flagged utterances as NDJSON"
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--listen", help="Accept TCP connections on [HOST:]PORT")
+    source.add_argument("--unix", help="Accept connections on a Unix socket path")
+    parser.add_argument("--use-llm", action="store_true")
+    parser.add_argument("--max-batch-size", type=int, default=MAX_BATCH_SIZE)
+    parser.add_argument(
+        "--max-batch-delay-ms", type=float, default=MAX_BATCH_DELAY * 1000
+    )
+    parser.add_argument(
+        "--stats-interval",
+        type=float,
+        default=10.0,
+        help="Seconds between stats snapshots on stderr (0 to disable)",
+    )
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
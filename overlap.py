@@ -0,0 +1,366 @@
+import heapq
+import numpy as np
+from transcripts import SPEAKER_CODES, Transcript
+
+
+def _speaker_segments(call_data, speaker):
+    """Return (index, entry) pairs for one speaker, skipping zero-length segments."""
+    return [
+        (idx, entry)
+        for idx, entry in enumerate(call_data)
+        if entry["speaker"].lower() == speaker and entry["etime"] > entry["stime"]
+    ]
+
+
+def _overlap_record(a, c):
+    """Build the overlap dict for an overlapping agent/customer segment pair."""
+    overlap_start = max(a["stime"], c["stime"])
+    overlap_end = min(a["etime"], c["etime"])
+    return {
+        "overlap_start": overlap_start,
+        "overlap_end": overlap_end,
+        "overlap_duration": overlap_end - overlap_start,
+        "agent_stime": a["stime"],
+        "agent_etime": a["etime"],
+        "customer_stime": c["stime"],
+        "customer_etime": c["etime"],
+        "initiator": "Customer" if c["stime"] > a["stime"] else "Agent",
+    }
+
+
+def detect_overlaps(call_data):
+    """Detect overlapping speech segments between Agent and Customer.
+
+    Segments are sorted by start time once and swept left to right. Each
+    speaker keeps a min-heap of its open segments keyed by end time, so a new
+    segment only meets the opposite speaker's segments that are still open,
+    giving O((A+C) log(A+C) + K) work for K overlaps instead of O(A*C).
+
+    A transcripts.Transcript is handled by the vectorized engine in
+    temporal.py instead, with the same result.
+
+    Args:
+        call_data (list or Transcript): Speech segments with speaker, text, stime, and etime
+
+    Returns:
+        list: Detected overlap segments with timing information, in the same
+        agent-then-customer transcript order as the pairwise comparison
+    """
+    if isinstance(call_data, Transcript):
+        return _detect_overlaps_columnar(call_data)
+
+    agent_segments = _speaker_segments(call_data, "agent")
+    customer_segments = _speaker_segments(call_data, "customer")
+
+    events = [(entry["stime"], 0, idx, entry) for idx, entry in agent_segments]
+    events += [(entry["stime"], 1, idx, entry) for idx, entry in customer_segments]
+    events.sort(key=lambda event: (event[0], event[1], event[2]))
+
+    # open_segments[0] holds agent segments, open_segments[1] customer segments
+    open_segments = ([], [])
+    pairs = []
+    for stime, side, idx, entry in events:
+        others = open_segments[1 - side]
+        while others and others[0][0] <= stime:
+            heapq.heappop(others)
+
+        # Every segment still open on the other side started at or before
+        # this one and ends after it starts, so each one is an overlap.
+        for _, other_idx, other in others:
+            if side == 0:
+                pairs.append((idx, other_idx, entry, other))
+            else:
+                pairs.append((other_idx, idx, other, entry))
+
+        heapq.heappush(open_segments[side], (entry["etime"], idx, entry))
+
+    pairs.sort(key=lambda pair: (pair[0], pair[1]))
+    return [_overlap_record(a, c) for _, _, a, c in pairs]
+
+
+def _detect_overlaps_columnar(transcript):
+    """detect_overlaps for a Transcript, straight from its time and speaker arrays"""
+    from temporal import CorpusArrays, _overlap_columns
+
+    corpus = CorpusArrays(
+        [None],
+        np.zeros(len(transcript), dtype=np.int64),
+        transcript.roles(),
+        transcript.stime,
+        transcript.etime,
+    )
+    columns = _overlap_columns(corpus)
+    del columns["call"]
+    return [
+        dict(zip(columns, values))
+        for values in zip(*(column.tolist() for column in columns.values()))
+    ]
+
+
+class IncrementalOverlapDetector:
+    """Online Agent/Customer overlap detection for a call that is still running.
+
+    Segments are fed with add() as the ASR emits them. They may arrive up to
+    allowed_lateness seconds out of order (by start time): segments wait in a
+    small reorder buffer until the latest start time seen has moved more than
+    allowed_lateness past them, and are then swept exactly like
+    detect_overlaps. Only segments that can still overlap a future segment
+    are kept open, and each segment costs O(log n) heap work plus its
+    overlaps. An overlap is emitted, initiator included, as soon as its later
+    segment leaves the buffer; close() flushes the rest at the end of the call.
+
+    Segments later than allowed_lateness are still matched against the open
+    segments but may miss overlaps with segments that already closed; they
+    are counted in late_segments.
+    """
+
+    def __init__(self, allowed_lateness=0.0):
+        self.allowed_lateness = allowed_lateness
+        self.late_segments = 0
+        self._seq = 0
+        self._buffer = []
+        self._open = ([], [])
+        self._max_stime = None
+        self._released_stime = None
+
+    def add(self, segment):
+        """Add one segment; returns the overlaps that became decidable."""
+        return [record for _, record in self._add(segment)]
+
+    def close(self):
+        """Flush the reorder buffer at the end of the call; returns the remaining overlaps."""
+        return [record for _, record in self._close()]
+
+    def _add(self, segment):
+        seq = self._seq
+        self._seq += 1
+
+        speaker = segment["speaker"].lower()
+        if speaker not in ("agent", "customer"):
+            return []
+        if not segment["etime"] > segment["stime"]:
+            return []
+
+        side = 0 if speaker == "agent" else 1
+        stime = segment["stime"]
+        if self._released_stime is not None and stime < self._released_stime:
+            # Too late to reorder: match against what is still open
+            self.late_segments += 1
+            return self._sweep(stime, side, seq, segment)
+
+        heapq.heappush(self._buffer, (stime, side, seq, segment))
+        if self._max_stime is None or stime > self._max_stime:
+            self._max_stime = stime
+
+        emitted = []
+        watermark = self._max_stime - self.allowed_lateness
+        while self._buffer and self._buffer[0][0] < watermark:
+            emitted.extend(self._sweep(*heapq.heappop(self._buffer)))
+        return emitted
+
+    def _close(self):
+        emitted = []
+        while self._buffer:
+            emitted.extend(self._sweep(*heapq.heappop(self._buffer)))
+        return emitted
+
+    def _sweep(self, stime, side, seq, segment):
+        if self._released_stime is None or stime > self._released_stime:
+            self._released_stime = stime
+
+        # Nothing that ended by now can overlap a later-starting segment
+        for open_segments in self._open:
+            while open_segments and open_segments[0][0] <= self._released_stime:
+                heapq.heappop(open_segments)
+
+        emitted = []
+        for etime, other_seq, other in self._open[1 - side]:
+            # A late segment can meet open segments that start after it ends
+            if etime <= stime or other["stime"] >= segment["etime"]:
+                continue
+            if side == 0:
+                emitted.append(((seq, other_seq), _overlap_record(segment, other)))
+            else:
+                emitted.append(((other_seq, seq), _overlap_record(other, segment)))
+
+        heapq.heappush(self._open[side], (segment["etime"], seq, segment))
+        return emitted
+
+
+def detect_overlaps_streaming(call_data, allowed_lateness=0.0):
+    """Replay call_data through IncrementalOverlapDetector in list order.
+
+    Returns the overlaps in the same order as detect_overlaps, which this must
+    equal whenever no segment is later than allowed_lateness.
+    """
+    detector = IncrementalOverlapDetector(allowed_lateness)
+    emitted = []
+    for segment in call_data:
+        emitted.extend(detector._add(segment))
+    emitted.extend(detector._close())
+    emitted.sort(key=lambda item: item[0])
+    return [record for _, record in emitted]
+
+
+def detect_crosstalk(call_data):
+    """Detect crosstalk between any number of speakers in one sorted sweep.
+
+    Unlike detect_overlaps this is not limited to Agent and Customer:
+    supervisors, transferred parties and conference participants are all
+    speakers. Speaker names are case-insensitive; Agent and Customer come
+    first, the others in order of first appearance.
+
+    Every segment contributes a start and an end event, sorted once (ends
+    before starts at equal times, so touching segments do not overlap). The
+    sweep keeps each speaker's open segments, which gives O(n log n + K)
+    work for n segments and K overlapping segment pairs:
+        - between consecutive events the set of talking speakers is fixed,
+          so its length is added to each talking pair's duration and to the
+          simultaneous-speaker timeline
+        - a starting segment overlaps every open segment of the other
+          speakers, which is where counts and initiators are taken
+
+    The initiator of an overlap is the speaker whose segment started later
+    (the one who talked over the other); on a tie it is the speaker listed
+    first, as in detect_overlaps.
+
+    Args:
+        call_data (list or Transcript): Speech segments with speaker, text, stime, and etime
+
+    Returns:
+        dict:
+            speakers: speaker names; the matrices below are indexed in this order
+            overlap_duration: [i][j] seconds during which i and j both talk
+            overlap_count: [i][j] overlapping segment pairs of i and j
+            initiated: [i][j] overlaps i started while j was talking
+            talk_time: seconds each speaker talks (own overlaps counted once)
+            overlaps: one dict per overlapping segment pair, in order of
+                overlap_start (speaker_a is listed before speaker_b)
+            timeline: {start, end, speakers} runs with a constant number of
+                simultaneous speakers, from the first start to the last end
+    """
+    if isinstance(call_data, Transcript):
+        names = call_data.speaker_names()
+        stimes = call_data.stime.tolist()
+        etimes = call_data.etime.tolist()
+    else:
+        names = [entry["speaker"] for entry in call_data]
+        stimes = [entry["stime"] for entry in call_data]
+        etimes = [entry["etime"] for entry in call_data]
+
+    first_names = {}
+    for name in names:
+        first_names.setdefault(name.lower(), name)
+    keys = sorted(
+        first_names, key=lambda key: SPEAKER_CODES.get(key, len(SPEAKER_CODES))
+    )
+    index = {key: i for i, key in enumerate(keys)}
+    speakers = [first_names[key] for key in keys]
+
+    events = []
+    for idx, (name, stime, etime) in enumerate(zip(names, stimes, etimes)):
+        if etime > stime:
+            side = index[name.lower()]
+            events.append((stime, 1, side, idx))
+            events.append((etime, 0, side, idx))
+    events.sort()
+
+    n = len(speakers)
+    duration = [[0.0] * n for _ in range(n)]
+    count = [[0] * n for _ in range(n)]
+    initiated = [[0] * n for _ in range(n)]
+    talk_time = [0.0] * n
+    overlaps = []
+    timeline = []
+
+    # open_segments[i] maps segment index to (stime, etime) for speaker i;
+    # talking counts the open segments of each speaker that has any
+    open_segments = [{} for _ in range(n)]
+    talking = {}
+    previous = None
+    for time, is_start, side, idx in events:
+        if previous is not None and time > previous:
+            elapsed = time - previous
+            active = sorted(talking)
+            for i, a in enumerate(active):
+                talk_time[a] += elapsed
+                for b in active[i + 1 :]:
+                    duration[a][b] += elapsed
+                    duration[b][a] += elapsed
+            if timeline and timeline[-1]["speakers"] == len(active):
+                timeline[-1]["end"] = time
+            else:
+                timeline.append(
+                    {"start": previous, "end": time, "speakers": len(active)}
+                )
+        previous = time
+
+        if not is_start:
+            del open_segments[side][idx]
+            talking[side] -= 1
+            if not talking[side]:
+                del talking[side]
+            continue
+
+        stime, etime = stimes[idx], etimes[idx]
+        for other in talking:
+            if other == side:
+                continue
+            for other_stime, other_etime in open_segments[other].values():
+                count[side][other] += 1
+                count[other][side] += 1
+                if other_stime < stime or (other_stime == stime and side < other):
+                    initiator, talked_over = side, other
+                else:
+                    initiator, talked_over = other, side
+                initiated[initiator][talked_over] += 1
+
+                if side < other:
+                    a, b = (stime, etime), (other_stime, other_etime)
+                else:
+                    a, b = (other_stime, other_etime), (stime, etime)
+                overlap_end = min(etime, other_etime)
+                overlaps.append(
+                    {
+                        "speaker_a": speakers[min(side, other)],
+                        "speaker_b": speakers[max(side, other)],
+                        "overlap_start": stime,
+                        "overlap_end": overlap_end,
+                        "overlap_duration": overlap_end - stime,
+                        "a_stime": a[0],
+                        "a_etime": a[1],
+                        "b_stime": b[0],
+                        "b_etime": b[1],
+                        "initiator": speakers[initiator],
+                    }
+                )
+
+        open_segments[side][idx] = (stime, etime)
+        talking[side] = talking.get(side, 0) + 1
+
+    return {
+        "speakers": speakers,
+        "overlap_duration": duration,
+        "overlap_count": count,
+        "initiated": initiated,
+        "talk_time": talk_time,
+        "overlaps": overlaps,
+        "timeline": timeline,
+    }
+
+
+def process_records(records):
+    """
+    Stream overlap rows for an iterable of {call_id, transcript} records,
+    e.g. from transcripts.iter_jsonl_records. Each row carries its file_id.
+    """
+    for record in records:
+        call_id = record.get("call_id", "unknown")
+        try:
+            overlaps = detect_overlaps(record.get("transcript", []))
+        except Exception as e:
+            print(f"Error processing {call_id}: {e}")
+            continue
+        for overlap in overlaps:
+            overlap["file_id"] = call_id
+            yield overlap
@@ -0,0 +1,252 @@
+import os
+import argparse
+import pyarrow as pa
+import pyarrow.parquet as pq
+from temporal import (
+    CorpusArrays,
+    _overlap_columns,
+    bin_counts,
+    call_stats,
+    corpus_overlaps,
+    overlap_bins,
+)
+from transcripts import iter_records
+
+# Charts the dashboard and the thumbnail cache can render for one call
+CHARTS = ["overlap_duration", "overlap_frequency", "initiator_distribution"]
+
+
+def write_overlap_store(records, directory, interval=5):
+    """
+    Write the per-call overlap data of a corpus to one indexed store.
+
+    Replaces the per-call PNG/CSV files of the temporal notebook with three
+    files, however many calls there are:
+        calls.parquet   one row per call (temporal.call_stats) plus the row
+                        offset and count of that call in the two files below
+        overlaps.arrow  every overlap (columns of overlap.detect_overlaps),
+                        grouped by call in calls.parquet order
+        bins.arrow      overlap counts per interval-second bin, same order
+
+    The .arrow files are uncompressed Arrow IPC, so OverlapStore memory-maps
+    them and reads one call's rows without loading the rest. No chart is
+    rendered here; the dashboard draws them when a call is opened.
+
+    Args:
+        records (iterable): {"call_id", "transcript"} records, e.g. from transcripts.iter_records
+        directory (str): Store directory (created if needed, files are replaced)
+        interval (int): Bin width in seconds for bins.arrow
+
+    Returns:
+        pandas.DataFrame: The calls table that was written
+    """
+    corpus = CorpusArrays.from_records(records)
+    columns = _overlap_columns(corpus)
+    calls = call_stats(corpus, _columns=columns)
+    overlaps = corpus_overlaps(corpus, _columns=columns)
+    bins = overlap_bins(corpus, interval, _columns=columns)
+
+    # Both tables are grouped by call in corpus order, so each call's rows
+    # start where the previous call's end
+    calls["overlap_offset"] = calls["total_overlaps"].cumsum() - calls["total_overlaps"]
+    calls["bin_count"] = bin_counts(calls["call_end"], interval)
+    calls["bin_offset"] = calls["bin_count"].cumsum() - calls["bin_count"]
+
+    os.makedirs(directory, exist_ok=True)
+    _write_arrow(overlaps, os.path.join(directory, "overlaps.arrow"))
+    _write_arrow(bins, os.path.join(directory, "bins.arrow"))
+    pq.write_table(
+        pa.Table.from_pandas(calls, preserve_index=False).replace_schema_metadata(
+            {"interval": str(interval)}
+        ),
+        os.path.join(directory, "calls.parquet"),
+        compression="zstd",
+    )
+    return calls
+
+
+def _write_arrow(df, path):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.OSFile(path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=65536)
+
+
+class OverlapStore:
+    """
+    Read access to a store written by write_overlap_store.
+
+    The calls table is loaded on open; overlaps and bins are memory-mapped
+    and sliced per call, so opening one call costs the same whether the
+    store holds a hundred calls or a million.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        calls = pq.read_table(os.path.join(directory, "calls.parquet"))
+        self.interval = int((calls.schema.metadata or {}).get(b"interval", b"5"))
+        self.calls = calls.to_pandas()
+        self.index = {call_id: i for i, call_id in enumerate(self.calls["call_id"])}
+        self._overlaps = self._map("overlaps.arrow")
+        self._bins = self._map("bins.arrow")
+
+    def _map(self, name):
+        source = pa.memory_map(os.path.join(self.directory, name), "r")
+        return pa.ipc.open_file(source).read_all()
+
+    def __len__(self):
+        return len(self.calls)
+
+    def __contains__(self, call_id):
+        return call_id in self.index
+
+    @property
+    def call_ids(self):
+        return list(self.calls["call_id"])
+
+    def call(self, call_id):
+        """The calls-table row of one call, as a dict"""
+        return self.calls.iloc[self.index[call_id]].to_dict()
+
+    def overlaps(self, call_id):
+        """One call's overlaps as a DataFrame (detect_overlaps columns plus file_id)"""
+        row = self.calls.iloc[self.index[call_id]]
+        return self._overlaps.slice(
+            int(row["overlap_offset"]), int(row["total_overlaps"])
+        ).to_pandas()
+
+    def bins(self, call_id):
+        """One call's binned overlap counts: call_id, bin_start, overlap_count"""
+        row = self.calls.iloc[self.index[call_id]]
+        return self._bins.slice(
+            int(row["bin_offset"]), int(row["bin_count"])
+        ).to_pandas()
+
+
+class ThumbnailCache:
+    """
+    Bounded on-disk cache of small PNG previews of the per-call charts.
+
+    A preview is rendered from the store the first time it is asked for.
+    When more than max_items are cached, the least recently used ones are
+    deleted, so the cache never grows with the corpus.
+    """
+
+    def __init__(self, store, directory=None, max_items=200, dpi=60):
+        self.store = store
+        self.directory = directory or os.path.join(store.directory, "thumbnails")
+        self.max_items = max_items
+        self.dpi = dpi
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, call_id, chart):
+        safe_id = "".join(c if c.isalnum() or c in "-_." else "_" for c in call_id)
+        return os.path.join(self.directory, f"{safe_id}_{chart}.png")
+
+    def get(self, call_id, chart="overlap_duration"):
+        """Path to the PNG preview of chart for call_id, rendering it on a miss"""
+        path = self.path(call_id, chart)
+        if os.path.exists(path):
+            os.utime(path)
+            return path
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        render_chart(self.store, call_id, chart).savefig(
+            tmp_path, format="png", dpi=self.dpi, bbox_inches="tight"
+        )
+        os.replace(tmp_path, path)
+        self._evict()
+        return path
+
+    def _evict(self):
+        entries = [
+            entry for entry in os.scandir(self.directory) if entry.name.endswith(".png")
+        ]
+        if len(entries) <= self.max_items:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[: len(entries) - self.max_items]:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+
+def render_chart(store, call_id, chart, figsize=(4, 2.5)):
+    """
+    Draw one of CHARTS for a call as a matplotlib Figure.
+
+    Uses the Figure API rather than pyplot, so nothing is shown and
+    rendering is safe from the dashboard's threads.
+    """
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    ax = fig.add_subplot()
+    if chart == "overlap_duration":
+        overlaps = store.overlaps(call_id)
+        ax.bar(
+            overlaps["overlap_start"],
+            overlaps["overlap_duration"],
+            width=0.5,
+            color="purple",
+            alpha=0.7,
+        )
+        ax.set_xlabel("Time (seconds)")
+        ax.set_ylabel("Overlap (s)")
+    elif chart == "overlap_frequency":
+        bins = store.bins(call_id)
+        ax.bar(
+            bins["bin_start"],
+            bins["overlap_count"],
+            width=store.interval,
+            align="edge",
+            color="teal",
+            alpha=0.7,
+        )
+        ax.set_xlabel("Time (seconds)")
+        ax.set_ylabel("Overlaps")
+    elif chart == "initiator_distribution":
+        counts = store.overlaps(call_id)["initiator"].value_counts()
+        if len(counts):
+            ax.pie(
+                counts.values,
+                labels=counts.index,
+                autopct="%1.0f%%",
+                colors=["lightblue", "lightcoral"],
+                startangle=90,
+            )
+    else:
+        raise ValueError(f"Unknown chart: {chart}")
+    ax.set_title(call_id[:8], fontsize=9)
+    return fig
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Write the per-call overlap store for the dashboard"
+    )
+    parser.add_argument("input", help="JSONL export or directory of JSON transcripts")
+    parser.add_argument("output", help="Store directory")
+    parser.add_argument("--interval", type=int, default=5)
+    parser.add_argument(
+        "--thumbnails",
+        type=int,
+        default=0,
+        help="Pre-render previews for the N calls with the most overlap",
+    )
+    args = parser.parse_args()
+
+    calls = write_overlap_store(iter_records(args.input), args.output, args.interval)
+    print(
+        f"Wrote {len(calls)} calls and {int(calls['total_overlaps'].sum())} overlaps "
+        f"to {args.output}"
+    )
+    if args.thumbnails:
+        store = OverlapStore(args.output)
+        cache = ThumbnailCache(store, max_items=args.thumbnails * len(CHARTS))
+        top = calls.nlargest(args.thumbnails, "total_overlap_duration")
+        for call_id in top["call_id"]:
+            for chart in CHARTS:
+                cache.get(call_id, chart)
+        print(f"Rendered previews for {len(top)} calls into {cache.directory}")
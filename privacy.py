@@ -1,42 +1,150 @@
 import os
 import json
-import pandas as pd
-from groq import Groq
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import metrics
 from prompts import create_llama_3_3_system_prompt
+from compaction import compact_transcript, count_tokens
+from triage import TriageCounter, triage_call, skipped_verdict
+from llm_cache import get_default_cache
+from ratelimit import RateLimiter, estimate_tokens
+from transcripts import Transcript, read_transcript
+from tenacity import (
+    Retrying,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential,
+)
 from tqdm import tqdm
 from dotenv import load_dotenv
 
-
 load_dotenv()
 
 
+def is_retryable_error(error):
+    """Rate limits (429), server errors (5xx) and connection failures are worth retrying"""
+    import groq
+
+    if isinstance(error, groq.APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return isinstance(error, groq.APIConnectionError)
+
+
 class PrivacyComplianceDetector:
-    def __init__(self, api_key=None):
-        """Initialize the compliance detector with Groq API"""
+    def __init__(
+        self,
+        api_key=None,
+        base_url=None,
+        requests_per_minute=None,
+        tokens_per_minute=None,
+        max_retries=5,
+        cache=True,
+        compact=False,
+        compact_window=None,
+        triage=False,
+    ):
+        """
+        Initialize the compliance detector with Groq API
+
+        Args:
+            api_key (str, optional): Groq API key, defaults to GROQ_API_KEY
+            base_url (str, optional): Alternative chat-completions endpoint, e.g. a local fake server
+            requests_per_minute (int, optional): Client-side request rate limit
+            tokens_per_minute (int, optional): Client-side token rate limit (estimated per request)
+            max_retries (int): Retries with exponential backoff on 429/5xx and connection errors
+            cache (bool or LLMCache): Reuse verdicts for identical requests. True uses the
+                shared on-disk cache, False disables caching, or pass an LLMCache instance
+            compact (bool): Send a compacted transcript (merged turns, no timestamps)
+                and record the estimated tokens saved in each result
+            compact_window (int, optional): With compact, keep only the turns within
+                this many turns of a verification or disclosure cue
+            triage (bool): Screen each call with local rules first and only send calls
+                where the agent disclosed amounts or account details to the LLM
+        """
         self.api_key = api_key or os.environ.get("GROQ_API_KEY")
         if not self.api_key:
             raise ValueError(
                 "Groq API key is required. Set GROQ_API_KEY environment variable or pass it directly."
             )
 
-        self.client = Groq(api_key=self.api_key)
-        self.system_prompt = create_llama_3_3_system_prompt()
+        # Retries are handled by tenacity below, not by the client
+        from groq import Groq
 
-    def format_transcript(self, transcript_data):
+        self.client = Groq(api_key=self.api_key, base_url=base_url, max_retries=0)
+        self.system_prompt = create_llama_3_3_system_prompt()
+        self.rate_limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        self.retrying = Retrying(
+            retry=retry_if_exception(is_retryable_error),
+            wait=wait_exponential(multiplier=1, min=1, max=60),
+            stop=stop_after_attempt(max_retries + 1),
+            before_sleep=lambda state: metrics.inc(
+                "llm_retries_total", api="compliance"
+            ),
+            reraise=True,
+        )
+        if cache is True:
+            cache = get_default_cache()
+        self.cache = cache or None
+        self.compact = compact
+        self.compact_window = compact_window
+        self.triage = triage
+        self.triage_counter = TriageCounter()
+
+    def _create_completion(self, messages, **kwargs):
+        """Send one chat-completions request once the rate limiter allows it"""
+        self.rate_limiter.acquire(
+            estimate_tokens(messages, kwargs.get("max_tokens", 0))
+        )
+        with metrics.timer("llm_request_seconds", api="compliance"):
+            return self.client.chat.completions.create(messages=messages, **kwargs)
+
+    @staticmethod
+    def format_transcript(transcript_data):
         """Format the transcript data into a readable format for the model"""
+        if isinstance(transcript_data, Transcript):
+            rows = transcript_data.rows()
+        else:
+            rows = (
+                (
+                    entry.get("speaker", "Unknown"),
+                    entry.get("text", ""),
+                    entry.get("stime", ""),
+                    entry.get("etime", ""),
+                )
+                for entry in transcript_data
+            )
+
         formatted_text = []
-        for entry in transcript_data:
-            speaker = entry.get("speaker", "Unknown")
-            text = entry.get("text", "")
-            time_start = entry.get("stime", "")
-            time_end = entry.get("etime", "")
+        for speaker, text, time_start, time_end in rows:
             formatted_text.append(f"{speaker} [{time_start}-{time_end}]: {text}")
 
         return "\n".join(formatted_text)
 
     def analyze_call_transcript(self, call_id, transcript_data):
         """Analyze a call transcript for privacy compliance violations"""
+        with metrics.timer("compliance_call_seconds"):
+            return self._analyze_call_transcript(call_id, transcript_data)
+
+    def _analyze_call_transcript(self, call_id, transcript_data):
+        # Calls with no sensitive disclosure cannot be violations
+        token_report = {}
+        if self.triage:
+            triage = triage_call(transcript_data)
+            self.triage_counter.record(triage["decision"])
+            metrics.inc("compliance_triage_total", decision=triage["decision"])
+            if triage["decision"] == "skip":
+                return skipped_verdict(call_id, triage)
+            token_report["triage"] = "escalated"
+
         formatted_transcript = self.format_transcript(transcript_data)
+        if self.compact:
+            compacted = compact_transcript(transcript_data, window=self.compact_window)
+            token_report["transcript_tokens"] = count_tokens(compacted)
+            token_report["tokens_saved"] = count_tokens(
+                formatted_transcript
+            ) - count_tokens(compacted)
+            metrics.inc("compliance_tokens_saved_total", token_report["tokens_saved"])
+            formatted_transcript = compacted
 
         # Prepare the user prompt with the transcript to analyze
         user_prompt = f"""Please analyze this call center transcript for privacy compliance violations:
@@ -60,25 +168,40 @@ Provide your analysis in the following JSON format:
             {"role": "user", "content": user_prompt},
         ]
 
-        # Call the Groq API with Llama 3.3
+        request = {
+            "model": "meta-llama/llama-4-scout-17b-16e-instruct",
+            "messages": messages,
+            "temperature": 0.2,  # Lower temperature for more deterministic responses
+            "max_tokens": 1024,
+            "response_format": {"type": "json_object"},
+        }
+
+        # Call the Groq API with Llama 3.3, unless this exact request was
+        # already answered by the same endpoint
+        endpoint = str(self.client.base_url)
         try:
-            response = self.client.chat.completions.create(
-                model="meta-llama/llama-4-scout-17b-16e-instruct",
-                messages=messages,
-                temperature=0.2,  # Lower temperature for more deterministic responses
-                max_tokens=1024,
-                response_format={"type": "json_object"},
-            )
+            response_content = self.cache.get(request, endpoint) if self.cache else None
+            if response_content is not None:
+                metrics.inc("llm_requests_total", api="compliance", outcome="cache_hit")
+                result = json.loads(response_content)
+            else:
+                response = self.retrying.copy()(self._create_completion, **request)
+                metrics.record_llm_usage("compliance", response)
 
-            # Parse the model's response
-            response_content = response.choices[0].message.content
-            result = json.loads(response_content)
+                # Parse the model's response
+                response_content = response.choices[0].message.content
+                result = json.loads(response_content)
+                if self.cache:
+                    self.cache.set(request, response_content, endpoint)
+                metrics.inc("llm_requests_total", api="compliance", outcome="ok")
 
             # Add the call_id to the result
             result["call_id"] = call_id
+            result.update(token_report)
             return result
 
         except Exception as e:
+            metrics.inc("llm_requests_total", api="compliance", outcome="error")
             print(f"Error analyzing call {call_id}: {e}")
             return {
                 "call_id": call_id,
@@ -88,20 +211,50 @@ Provide your analysis in the following JSON format:
                 "sensitive_info_shared": False,
             }
 
-    def batch_process_calls(self, call_data_list):
-        """Process multiple call transcripts and identify violations"""
-        results = []
+    def _analyze_call_data(self, call_data):
+        call_id = call_data.get("call_id", "unknown")
+        transcript = call_data.get("transcript", [])
+        return self.analyze_call_transcript(call_id, transcript)
 
-        for call_data in call_data_list:
-            call_id = call_data.get("call_id", "unknown")
-            transcript = call_data.get("transcript", [])
+    def iter_analyses(self, call_data_iter, max_concurrency=1):
+        """
+        Analyze call transcripts from any iterable and yield results in input order.
 
-            analysis = self.analyze_call_transcript(call_id, transcript)
-            results.append(analysis)
+        At most a few calls per worker are in flight at once, so a lazy
+        iterable (e.g. files loaded on demand) is never read into memory whole.
+        """
+        max_concurrency = max(1, max_concurrency)
+        in_flight = deque()
+
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            for call_data in call_data_iter:
+                in_flight.append(executor.submit(self._analyze_call_data, call_data))
+                if len(in_flight) >= max_concurrency * 2:
+                    yield self._report(in_flight.popleft().result())
+
+            while in_flight:
+                yield self._report(in_flight.popleft().result())
+
+    @staticmethod
+    def _report(analysis):
+        # If there's a violation, print it out
+        if analysis.get("is_violation", False):
+            print(f"⚠️ Violation detected in call {analysis['call_id']}")
+        return analysis
+
+    def batch_process_calls(self, call_data_list, max_concurrency=1):
+        """
+        Process multiple call transcripts and identify violations
 
-            # If there's a violation, print it out
-            if analysis.get("is_violation", False):
-                print(f"⚠️ Violation detected in call {call_id}")
+        Args:
+            call_data_list (list): Dicts with call_id and transcript
+            max_concurrency (int): Number of calls analyzed at once on a thread
+                pool. Requests still respect the detector's rate limits, and
+                results keep the order of call_data_list.
+        """
+        import pandas as pd
+
+        results = list(self.iter_analyses(call_data_list, max_concurrency))
 
         # Convert results to DataFrame for easier analysis
         df_results = pd.DataFrame(results)
@@ -112,33 +265,133 @@ Provide your analysis in the following JSON format:
 
         return df_results
 
-    def process_directory(self, directory_path, limit=-1, save_to_csv=True):
-        """Process all JSON files in a directory"""
-        call_data_list = []
+    @staticmethod
+    def load_checkpoint(checkpoint_path):
+        """
+        Read the results already written to a checkpoint file.
 
-        # List all JSON files in the directory
-        json_files = [f for f in os.listdir(directory_path) if f.endswith(".json")]
-        print(f"Found {len(json_files)} JSON files to process")
+        Returns:
+            dict: call_id -> latest result recorded for that call
+        """
+        completed = {}
+        if not os.path.exists(checkpoint_path):
+            return completed
+
+        with open(checkpoint_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    result = json.loads(line)
+                except json.JSONDecodeError:
+                    # A run killed mid-write can leave a truncated last line
+                    continue
+                completed[result.get("call_id")] = result
+        return completed
+
+    @staticmethod
+    def _load_call(directory_path, filename):
+        file_path = os.path.join(directory_path, filename)
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                return {"call_id": filename, "transcript": json.load(f)}
+        except Exception as e:
+            print(f"Error loading {file_path}: {e}")
+            return None
+
+    def process_directory(
+        self,
+        directory_path,
+        limit=-1,
+        save_to_csv=True,
+        max_concurrency=1,
+        checkpoint_path="compliance_results.jsonl",
+        csv_path="compliance_violations.csv",
+        parquet_dir=None,
+    ):
+        """
+        Process all JSON files in a directory, resuming from a checkpoint
 
-        for idx, filename in enumerate(tqdm(json_files)):
-            if limit > 0 and idx >= limit:
-                break
-            file_path = os.path.join(directory_path, filename)
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+        Each result is appended to checkpoint_path (one JSON object per line) as
+        soon as it is available, so an interrupted run loses at most the calls
+        in flight. On the next run, calls with a successful result in the
+        checkpoint are skipped, and only missing or failed calls are analyzed.
+        When triage is off, calls that triage skipped (triage == "skipped", no
+        LLM verdict) are analyzed again as well.
 
-                call_data_list.append({"call_id": filename, "transcript": data})
+        Args:
+            directory_path (str): Directory of JSON transcripts
+            limit (int): Only consider the first `limit` files (in name order) if > 0
+            save_to_csv (bool): Write all results to csv_path at the end
+            max_concurrency (int): Number of calls analyzed at once
+            checkpoint_path (str): JSONL file of completed results
+            csv_path (str): Path of the final CSV report
+            parquet_dir (str, optional): Also write verdicts to the Parquet results store here
 
-            except Exception as e:
-                print(f"Error loading {file_path}: {e}")
+        Returns:
+            pandas.DataFrame: One row per analyzed call, in file name order
+        """
+        # List all JSON files in the directory
+        json_files = sorted(
+            f for f in os.listdir(directory_path) if f.endswith(".json")
+        )
+        if limit > 0:
+            json_files = json_files[:limit]
+
+        completed = self.load_checkpoint(checkpoint_path)
+
+        def needs_analysis(filename):
+            result = completed.get(filename)
+            if result is None or "error" in result:
+                return True
+            return not self.triage and result.get("triage") == "skipped"
+
+        pending = [filename for filename in json_files if needs_analysis(filename)]
+        print(
+            f"Found {len(json_files)} JSON files to process, "
+            f"{len(json_files) - len(pending)} already analyzed"
+        )
+
+        # Transcripts are loaded lazily, only as workers become free
+        call_data_iter = (
+            call_data
+            for call_data in (
+                self._load_call(directory_path, filename) for filename in pending
+            )
+            if call_data is not None
+        )
+
+        with open(checkpoint_path, "a", encoding="utf-8") as checkpoint:
+            for analysis in tqdm(
+                self.iter_analyses(call_data_iter, max_concurrency), total=len(pending)
+            ):
+                checkpoint.write(json.dumps(analysis) + "\n")
+                checkpoint.flush()
+                completed[analysis["call_id"]] = analysis
+
+        if self.triage:
+            stats = self.triage_counter.stats()
+            print(
+                f"Triage skipped {stats['skipped']}/{stats['calls']} calls "
+                f"({stats['skip_rate']:.1%}) without an LLM request"
+            )
+
+        import pandas as pd
 
-        # Process all calls and get violations
-        results_df = self.batch_process_calls(call_data_list)
+        results_df = pd.DataFrame(
+            [completed[filename] for filename in json_files if filename in completed]
+        )
         if save_to_csv:
-            results_df.to_csv("compliance_violations.csv", index=False)
-            print("Results saved to compliance_violations.csv")
-        return self.batch_process_calls(call_data_list)
+            results_df.to_csv(csv_path, index=False)
+            print(f"Results saved to {csv_path}")
+        if parquet_dir:
+            from columnar import write_parquet
+
+            count = write_parquet(
+                (completed[f] for f in json_files if f in completed),
+                parquet_dir,
+                "compliance",
+            )
+            print(f"Saved {count} verdicts to {parquet_dir}")
+        return results_df
 
     def process_single_file(
         self, file_path, upload=False, save_to_csv=False, csv_path=None
@@ -163,15 +416,16 @@ Provide your analysis in the following JSON format:
                 # Extract filename for call_id
                 filename = os.path.basename(file_path)
 
-                # Load the JSON file
-                with open(file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                # Decode and validate the JSON file incrementally
+                data = read_transcript(file_path)
 
             # Analyze the transcript
             print(f"Analyzing file: {filename}")
             analysis_result = self.analyze_call_transcript(filename, data)
 
             # Create a single-row DataFrame for consistent output format
+            import pandas as pd
+
             result_df = pd.DataFrame([analysis_result])
 
             # Save to CSV if requested
@@ -199,11 +453,11 @@ Provide your analysis in the following JSON format:
                 "verification_performed": False,
                 "sensitive_info_shared": False,
             }
-        except json.JSONDecodeError:
-            print(f"Error: Invalid JSON format in file: {file_path}")
+        except ValueError as e:
+            print(f"Error: Invalid transcript in file: {file_path}: {e}")
             return {
                 "call_id": os.path.basename(file_path),
-                "error": "Invalid JSON format",
+                "error": f"Invalid transcript: {e}",
                 "is_violation": False,
                 "verification_performed": False,
                 "sensitive_info_shared": False,
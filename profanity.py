@@ -1,41 +1,130 @@
-import re
-from profanity_check import predict, predict_prob
-from better_profanity import profanity
 import os
 import json
-import pandas as pd
-from groq import Groq
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+import metrics
 from prompts import create_profanity_prompt
+from lexical import LexicalProfanityEngine
+from llm_cache import get_default_cache
+from transcripts import Transcript, iter_json_array
 from dotenv import load_dotenv
 
 load_dotenv()
 
-# Configure better_profanity with English profanity list
-profanity.load_censor_words()
+# Probability above which the ML stage flags an utterance
+ML_THRESHOLD = 0.7
+
+# Number of unresolved utterances scored per predict_prob call
+ML_BATCH_SIZE = 512
+
+# Number of utterances sent to the LLM in one request
+LLM_BATCH_SIZE = 25
+
+# Transcript entries decoded and checked at a time when reading a file
+FILE_BATCH_SIZE = 4096
+
+# Groq clients shared by every LLM check in this process, keyed by API key
+_groq_clients = {}
+_groq_clients_lock = threading.Lock()
+
+# The wordlist engine and the ML model are loaded on first use, not at import,
+# so importing this module (e.g. from the dashboard) stays cheap
+_lexical_engine = None
+_lexical_engine_lock = threading.Lock()
+
+
+def get_lexical_engine():
+    """Load the better_profanity wordlist and compile the lexical engine on first use"""
+    global _lexical_engine
+    with _lexical_engine_lock:
+        if _lexical_engine is None:
+            from better_profanity import profanity
+
+            # Configure better_profanity with English profanity list
+            profanity.load_censor_words()
+
+            # Compiled regex and wordlist matcher for the lexical stages
+            _lexical_engine = LexicalProfanityEngine(profanity.CENSOR_WORDSET)
+        return _lexical_engine
+
+
+def predict_prob(texts):
+    """profanity_check.predict_prob, importing scikit-learn and the model on first use"""
+    from profanity_check import predict_prob as profanity_check_predict_prob
+
+    return profanity_check_predict_prob(texts)
 
 
 def process_file(filepath, use_llm=False, file_upload=[{}], upload=False):
-    """Process a single JSON file and extract profanity information"""
-    if upload:
-        data = file_upload
-        file_id = "temp"
-    else:
-        file_id = os.path.basename(filepath)
+    """
+    Process a single JSON file and extract profanity information.
 
-        try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except Exception as e:
-            print(f"Error loading {filepath}: {e}")
-            return []
+    The file is decoded incrementally and checked FILE_BATCH_SIZE entries at
+    a time, so memory does not grow with the length of the transcript.
+    Entries only need to be objects (missing fields are read as empty, as
+    before); any other element is reported and skipped. If the file turns
+    out to be malformed partway through, the error is reported and the rows
+    found in the entries before it are returned.
+
+    profanity_file_seconds times the whole file, decoding included.
+    """
+    with metrics.timer("profanity_file_seconds"):
+        if upload:
+            return profanity_rows("temp", file_upload, use_llm=use_llm)
+        return _process_json_file(filepath, use_llm)
 
+
+def _process_json_file(filepath, use_llm):
+    file_id = os.path.basename(filepath)
+    entries = enumerate(iter_json_array(filepath))
     results = []
-    for entry in data:
-        text = entry.get("text", "")
-        is_profane, method, profane_terms = english_profanity_checker(
-            text, api_key=os.environ.get("GROQ_API_KEY"), use_llm=use_llm
-        )
+    batch = []
+    index = -1
+    while True:
+        try:
+            index, entry = next(entries)
+        except StopIteration:
+            break
+        except (OSError, ValueError) as e:
+            kept = f" (keeping rows from the {index + 1} entries before it)"
+            print(f"Error loading {filepath}: {e}{kept if index >= 0 else ''}")
+            break
+        if not isinstance(entry, dict):
+            print(f"Skipping entry {index} of {filepath}: expected an object")
+            continue
+        batch.append(entry)
+        if len(batch) == FILE_BATCH_SIZE:
+            results.extend(profanity_rows(file_id, batch, use_llm=use_llm))
+            batch = []
+    if batch:
+        results.extend(profanity_rows(file_id, batch, use_llm=use_llm))
+    return results
+
+
+def profanity_rows(file_id, data, use_llm=False):
+    """
+    Run the profanity checker over one transcript (a list of entry dicts or a
+    transcripts.Transcript) and return one row per profane term
+    """
+    if isinstance(data, Transcript):
+        texts = data.texts()
+        entries = [(speaker, stime, etime) for speaker, _, stime, etime in data.rows()]
+    else:
+        texts = [entry.get("text", "") for entry in data]
+        entries = [
+            (entry.get("speaker"), entry.get("stime"), entry.get("etime"))
+            for entry in data
+        ]
+    checks = check_profanity_batch(
+        texts, use_llm=use_llm, api_key=os.environ.get("GROQ_API_KEY")
+    )
 
+    results = []
+    for (speaker, stime, etime), text, (is_profane, method, profane_terms) in zip(
+        entries, texts, checks
+    ):
         if is_profane:
             # Ensure profane_terms is a list
             if not isinstance(profane_terms, list):
@@ -46,9 +135,9 @@ def process_file(filepath, use_llm=False, file_upload=[{}], upload=False):
                 results.append(
                     {
                         "file_id": file_id,
-                        "timestamp_start": entry.get("stime"),
-                        "timestamp_end": entry.get("etime"),
-                        "speaker": entry.get("speaker"),
+                        "timestamp_start": stime,
+                        "timestamp_end": etime,
+                        "speaker": speaker,
                         "profane_term": term,
                         "sentence": text,
                         "detection_method": method,
@@ -58,46 +147,152 @@ def process_file(filepath, use_llm=False, file_upload=[{}], upload=False):
     return results
 
 
-def process_directory(directory_path):
-    """Process all JSON files in a directory and compile profanity results"""
+def process_records(records, use_llm=False):
+    """
+    Stream profanity rows for an iterable of {call_id, transcript} records,
+    e.g. from transcripts.iter_jsonl_records. Only one call is held at a time.
+    """
+    for record in records:
+        call_id = record.get("call_id", "unknown")
+        try:
+            with metrics.timer("profanity_file_seconds"):
+                rows = profanity_rows(call_id, record.get("transcript", []), use_llm)
+        except Exception as e:
+            print(f"Error processing {call_id}: {e}")
+            continue
+        yield from rows
+
+
+def _init_worker():
+    """Load the wordlist and the profanity_check model once when a worker process starts"""
+    get_lexical_engine()
+    predict_prob([""])
+
+
+def _process_file_isolated(file_path):
+    """Run process_file, reporting errors instead of failing the whole directory"""
+    try:
+        return process_file(file_path)
+    except Exception as e:
+        print(f"Error processing {file_path}: {e}")
+        return []
+
+
+def process_directory(directory_path, workers=1):
+    """
+    Process all JSON files in a directory and compile profanity results.
+
+    With workers > 1 (or None for one per CPU) files are spread across a
+    process pool. Each worker imports this module once, so the wordlist and
+    the profanity_check model are loaded once per process, not per file.
+    """
     all_profanity_data = []
 
     # List all JSON files in the directory
-    json_files = [
+    json_files = sorted(
         os.path.join(directory_path, f)
         for f in os.listdir(directory_path)
         if f.endswith(".json")
-    ]
+    )
     print(f"Found {len(json_files)} JSON files to process")
 
-    # Process each file
-    for i, file_path in enumerate(json_files):
-        file_results = process_file(file_path)
-        all_profanity_data.extend(file_results)
+    workers = workers or os.cpu_count() or 1
+    with ExitStack() as stack:
+        if workers > 1:
+            executor = stack.enter_context(
+                ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+            )
+            chunksize = max(1, len(json_files) // (workers * 4))
+            file_results_iter = executor.map(
+                _process_file_isolated, json_files, chunksize=chunksize
+            )
+        else:
+            file_results_iter = map(_process_file_isolated, json_files)
+
+        # Process each file
+        for i, file_results in enumerate(file_results_iter):
+            all_profanity_data.extend(file_results)
+
+            # Print progress every 25 files
+            if (i + 1) % 25 == 0:
+                print(f"Processed {i + 1}/{len(json_files)} files")
 
-        # Print progress every 25 files
-        if (i + 1) % 25 == 0:
-            print(f"Processed {i + 1}/{len(json_files)} files")
+    import pandas as pd
 
     # Convert to pandas DataFrame
     df_profanity = pd.DataFrame(all_profanity_data)
 
     # Sort by file_id and timestamp_start for better readability
     if not df_profanity.empty:
-        df_profanity = df_profanity.sort_values(["file_id", "timestamp_start"])
+        df_profanity = df_profanity.sort_values(
+            ["file_id", "timestamp_start"], kind="mergesort"
+        )
 
     return df_profanity
 
 
-def check_profanity_with_llm(text, api_key=None):
-    """Use Groq's LLM to check for subtle or contextual profanity"""
+def get_groq_client(api_key):
+    """Return this process's shared Groq client for api_key, creating it on first use"""
+    with _groq_clients_lock:
+        client = _groq_clients.get(api_key)
+        if client is None:
+            from groq import Groq
+
+            client = _groq_clients[api_key] = Groq(api_key=api_key)
+        return client
+
+
+def _llm_json_completion(client, request, cache):
+    """
+    Send a JSON-mode chat request through the LLM cache.
+    Returns the parsed JSON object, or None if the call or parsing failed.
+    """
+    if cache is True:
+        cache = get_default_cache()
+    endpoint = str(client.base_url)
+
+    try:
+        result_text = cache.get(request, endpoint) if cache else None
+        cached = result_text is not None
+        if cached:
+            metrics.inc("llm_requests_total", api="profanity", outcome="cache_hit")
+        else:
+            with metrics.timer("llm_request_seconds", api="profanity"):
+                response = client.chat.completions.create(**request)
+            metrics.record_llm_usage("profanity", response)
+            result_text = response.choices[0].message.content
+        try:
+            result = json.loads(result_text)
+        except json.JSONDecodeError:
+            metrics.inc("llm_requests_total", api="profanity", outcome="invalid_json")
+            print(f"Warning: LLM returned non-JSON response: {result_text}")
+            return None
+        if not cached:
+            metrics.inc("llm_requests_total", api="profanity", outcome="ok")
+
+        if cache and not cached:
+            cache.set(request, result_text, endpoint)
+        return result
+
+    except Exception as e:
+        metrics.inc("llm_requests_total", api="profanity", outcome="error")
+        print(f"Warning: LLM profanity check failed with error: {e}")
+        return None
+
+
+def check_profanity_with_llm(text, api_key=None, cache=True):
+    """
+    Use Groq's LLM to check for subtle or contextual profanity.
+    Verdicts are reused from the shared LLM cache unless cache is False
+    (or replaced by an LLMCache instance).
+    """
     # Initialize Groq client
     api_key = api_key or os.environ.get("GROQ_API_KEY")
     if not api_key:
         print("Warning: No Groq API key provided. Skipping LLM check.")
         return False, None
 
-    client = Groq(api_key=api_key)
+    client = get_groq_client(api_key)
 
     # Create system prompt for effective profanity detection
     system_prompt = create_profanity_prompt()
@@ -112,102 +307,234 @@ If no profanity or offensive language is found:
 
 Only respond with the JSON object, nothing else."""
 
-    try:
-        response = client.chat.completions.create(
-            model="meta-llama/llama-4-scout-17b-16e-instruct",  # Using Llama 3.1 for best performance
-            messages=[
+    request = {
+        "model": "meta-llama/llama-4-scout-17b-16e-instruct",  # Using Llama 3.1 for best performance
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ],
+        "temperature": 0.1,  # Low temperature for consistent results
+        "max_tokens": 200,
+        "response_format": {"type": "json_object"},
+    }
+
+    result = _llm_json_completion(client, request, cache)
+
+    # If profanity was found
+    if result and result.get("detected", False) and result.get("terms", []):
+        return True, result.get("terms", [])
+
+    return False, None
+
+
+def check_profanity_with_llm_batch(texts, api_key=None, cache=True, chunk_size=None):
+    """
+    Check many texts with one LLM request per chunk of chunk_size texts
+    (default LLM_BATCH_SIZE) instead of one request per text.
+    Returns one (is_profane, terms) tuple per text, in order.
+    """
+    api_key = api_key or os.environ.get("GROQ_API_KEY")
+    if not api_key:
+        print("Warning: No Groq API key provided. Skipping LLM check.")
+        return [(False, None)] * len(texts)
+
+    client = get_groq_client(api_key)
+    system_prompt = create_profanity_prompt()
+    chunk_size = chunk_size or LLM_BATCH_SIZE
+
+    results = []
+    for chunk_start in range(0, len(texts), chunk_size):
+        chunk = texts[chunk_start : chunk_start + chunk_size]
+        utterances = json.dumps(
+            [{"index": i, "text": text} for i, text in enumerate(chunk)],
+            ensure_ascii=False,
+            indent=1,
+        )
+
+        user_prompt = f"""Analyze each of these numbered utterances for any profanity or offensive language:
+{utterances}
+
+Return a JSON object with one result per utterance, using the same index:
+{{"results": [{{"index": 0, "detected": true, "terms": ["term1", "term2", ...]}}, {{"index": 1, "detected": false, "terms": []}}, ...]}}
+
+Only respond with the JSON object, nothing else."""
+
+        request = {
+            "model": "meta-llama/llama-4-scout-17b-16e-instruct",
+            "messages": [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt},
             ],
-            temperature=0.1,  # Low temperature for consistent results
-            max_tokens=200,
-            response_format={"type": "json_object"},
-        )
+            "temperature": 0.1,  # Low temperature for consistent results
+            "max_tokens": 100 + 60 * len(chunk),
+            "response_format": {"type": "json_object"},
+        }
+
+        chunk_results = [(False, None)] * len(chunk)
+        result = _llm_json_completion(client, request, cache) or {}
+        for item in result.get("results", []):
+            if not isinstance(item, dict):
+                continue
+            index = item.get("index")
+            if (
+                isinstance(index, int)
+                and 0 <= index < len(chunk)
+                and item.get("detected", False)
+                and item.get("terms", [])
+            ):
+                chunk_results[index] = (True, item.get("terms", []))
+        results.extend(chunk_results)
 
-        result_text = response.choices[0].message.content
-        try:
-            result = json.loads(result_text)
+    return results
 
-            # If profanity was found
-            if result.get("detected", False) and result.get("terms", []):
-                return True, result.get("terms", [])
 
-            return False, None
-        except json.JSONDecodeError:
-            print(f"Warning: LLM returned non-JSON response: {result_text}")
-            return False, None
+def lexical_profanity_checker(text):
+    """
+    Run the regex and dictionary stages of the hybrid checker.
+    Returns (is_profane, method, detected_terms) or None if neither stage fired.
+    """
+    # Stage 1 (regex) and Stage 2 (dictionary) share one precompiled engine
+    method, spans = get_lexical_engine().scan(text)
+    return _lexical_verdict(text, method, spans)
 
-    except Exception as e:
-        print(f"Warning: LLM profanity check failed with error: {e}")
-        return False, None
 
+def _lexical_verdict(text, method, spans):
+    """Map lexical spans to the checker's (is_profane, method, terms) result."""
+    if not spans:
+        return None
 
-def english_profanity_checker(text, use_llm=False, api_key=None):
+    return True, method, [text[start:end] for start, end in spans]
+
+
+def _ml_verdict(probability):
+    """Map an ML probability to the checker's (is_profane, method, terms) result."""
+    if probability > ML_THRESHOLD:
+        return (
+            True,
+            "machine_learning",
+            [f"ML detection (probability: {probability})"],
+        )
+    return None
+
+
+def _predict_prob_batch(texts):
+    """Score texts with one predict_prob call, falling back to one call per text."""
+    try:
+        return list(predict_prob(texts))
+    except Exception:
+        probabilities = []
+        for text in texts:
+            try:
+                probabilities.append(predict_prob([text])[0])
+            except Exception as e:
+                print(f"Warning: ML detection failed with error: {e}")
+                probabilities.append(None)
+        return probabilities
+
+
+def ml_profanity_checker_batch(texts, batch_size=None):
     """
-    Hybrid approach for detecting profanity in English text.
-    Returns (is_profane, method, detected_terms)
+    Run the ML stage over texts with one vectorized predict_prob call per
+    chunk of batch_size texts (default ML_BATCH_SIZE).
+    Returns one (is_profane, method, detected_terms) tuple or None per text.
+    """
+    batch_size = batch_size or ML_BATCH_SIZE
+    results = []
+    for chunk_start in range(0, len(texts), batch_size):
+        probabilities = _predict_prob_batch(
+            texts[chunk_start : chunk_start + batch_size]
+        )
+        results.extend(
+            None if probability is None else _ml_verdict(probability)
+            for probability in probabilities
+        )
+    return results
 
-    Parameters:
-    - text: The text to check for profanity
-    - use_llm: Whether to use LLM as a final check (default: True)
-    - api_key: Groq API key (if None, will look for GROQ_API_KEY environment variable)
+
+def llm_profanity_checker_batch(texts, api_key=None):
     """
-    # Stage 1: Regex for common English profanity patterns
-    english_regex_patterns = [
-        r"\bf+[^\w]*u+[^\w]*c+[^\w]*k+\w*",
-        r"\bf+[^\w]*\*+[^\w]*c+[^\w]*k+\w*",
-        r"\bs+[^\w]*h+[^\w]*i+[^\w]*t+\w*",
-        r"\bs+[^\w]*\*+[^\w]*\*+[^\w]*t+\w*",
-        r"\bn+[^\w]*i+[^\w]*g+[^\w]*g+[^\w]*[^\w]*r+\w*",
-        r"\bb+[^\w]*i+[^\w]*t+[^\w]*c+[^\w]*h+\w*",
-        r"\ba+[^\w]*s+[^\w]*s+[^\w]*h+[^\w]*o+[^\w]*l+[^\w]*e+\w*",
-        r"\bp+[^\w]*[uo]+[^\w]*r+[^\w]*n+\w*",
-        r"\bp+[^\w]*e+[^\w]*n+[^\w]*i+[^\w]*s+\w*",
+    Run the LLM stage over texts in batched requests.
+    Returns one (is_profane, method, detected_terms) tuple or None per text.
+    """
+    return [
+        (True, "llm", profane_terms) if is_profane else None
+        for is_profane, profane_terms in check_profanity_with_llm_batch(
+            texts, api_key=api_key
+        )
     ]
 
-    # Check against regex patterns - find ALL matches
-    regex_matches = []
-    for pattern in english_regex_patterns:
-        matches = re.finditer(pattern, text, re.IGNORECASE)
-        for match in matches:
-            regex_matches.append(match.group(0))
 
-    if regex_matches:
-        return True, "regex", regex_matches
+def check_profanity_batch(texts, use_llm=False, api_key=None, batch_size=None):
+    """
+    Batched version of english_profanity_checker for a list of texts.
+    Returns one (is_profane, method, detected_terms) tuple per text, identical
+    to calling english_profanity_checker on each text in turn.
 
-    # Stage 2: Dictionary-based check with better_profanity
-    if profanity.contains_profanity(text):
-        censored = profanity.censor(text, "*")
-        words = text.split()
-        censored_words = censored.split()
-        profane_terms = []
+    The regex and dictionary stages run over every text first; the texts they
+    leave unresolved are scored with one vectorized predict_prob call per chunk
+    of batch_size texts (default ML_BATCH_SIZE), and only then go to the LLM.
+    """
+    engine = get_lexical_engine()
+
+    # Stage 1: regex patterns, over every text
+    with metrics.timer("profanity_stage_seconds", stage="regex"):
+        results = [
+            _lexical_verdict(text, "regex", engine.regex_spans(text)) for text in texts
+        ]
+
+    # Stage 2: better_profanity wordlist, for what the regex left
+    unresolved = [idx for idx, result in enumerate(results) if result is None]
+    with metrics.timer("profanity_stage_seconds", stage="dictionary"):
+        for idx in unresolved:
+            results[idx] = _lexical_verdict(
+                texts[idx], "dictionary", engine.wordlist_spans(texts[idx])
+            )
 
-        for original, censored in zip(words, censored_words):
-            if "*" in censored:
-                profane_terms.append(original)
+    # Stage 3: ML-based detection for subtle cases, batched
+    unresolved = [idx for idx, result in enumerate(results) if result is None]
+    if unresolved:
+        with metrics.timer("profanity_stage_seconds", stage="machine_learning"):
+            ml_results = ml_profanity_checker_batch(
+                [texts[idx] for idx in unresolved], batch_size=batch_size
+            )
+        for idx, result in zip(unresolved, ml_results):
+            results[idx] = result
+
+    # Stage 4: LLM-based detection as a last resort, batched per chunk
+    unresolved = [idx for idx, result in enumerate(results) if result is None]
+    if use_llm and unresolved:
+        with metrics.timer("profanity_stage_seconds", stage="llm"):
+            llm_results = llm_profanity_checker_batch(
+                [texts[idx] for idx in unresolved], api_key=api_key
+            )
+        for idx, result in zip(unresolved, llm_results):
+            if result is not None:
+                print("llm", result[2])
+                results[idx] = result
 
-        return True, "dictionary", profane_terms
+    for idx in unresolved:
+        if results[idx] is None:
+            results[idx] = (False, None, None)
 
-    # Stage 3: ML-based detection for subtle cases
-    try:
-        probability = predict_prob([text])[0]
-        if probability > 0.7:  # Adjustable threshold
-            return (
-                True,
-                "machine_learning",
-                [f"ML detection (probability: {probability})"],
-            )
-    except Exception as e:
-        print(f"Warning: ML detection failed with error: {e}")
+    if metrics.REGISTRY.enabled:
+        metrics.inc("profanity_utterances_total", len(texts))
+        for method, count in Counter(result[1] for result in results).items():
+            metrics.inc("profanity_resolved_total", count, stage=method or "clean")
+
+    return results
 
-    # Stage 4: LLM-based detection as a last resort
-    if use_llm:
-        is_profane, profane_terms = check_profanity_with_llm(text, api_key)
-        if is_profane:
-            print("llm", profane_terms)
-            return True, "llm", profane_terms
 
-    return False, None, None
+def english_profanity_checker(text, use_llm=False, api_key=None):
+    """
+    Hybrid approach for detecting profanity in English text.
+    Returns (is_profane, method, detected_terms)
+
+    Parameters:
+    - text: The text to check for profanity
+    - use_llm: Whether to use LLM as a final check (default: True)
+    - api_key: Groq API key (if None, will look for GROQ_API_KEY environment variable)
+    """
+    return check_profanity_batch([text], use_llm=use_llm, api_key=api_key)[0]
 
 
 # if __name__ == "__main__":
@@ -0,0 +1,63 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at a per-minute rate."""
+
+    def __init__(self, per_minute, capacity=None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, amount=1):
+        """Block until `amount` tokens are available, then take them"""
+        # A request larger than the bucket could never be served otherwise
+        amount = min(amount, self.capacity)
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def try_acquire(self, amount=1):
+        """Take `amount` tokens if they are available now; returns whether it did"""
+        with self.lock:
+            self._refill()
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return True
+            return False
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limits for an LLM API."""
+
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None):
+        self.requests = (
+            TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+    def acquire(self, tokens=0):
+        """Block until one request carrying `tokens` tokens may be sent"""
+        if self.requests is not None:
+            self.requests.acquire(1)
+        if self.tokens is not None and tokens:
+            self.tokens.acquire(tokens)
+
+
+def estimate_tokens(messages, max_tokens=0):
+    """Rough token count for a chat request: ~4 characters per token plus the completion budget"""
+    characters = sum(len(message["content"]) for message in messages)
+    return characters // 4 + max_tokens
@@ -0,0 +1,301 @@
+import numpy as np
+import pandas as pd
+from transcripts import AGENT, CUSTOMER, OTHER, SPEAKER_CODES, Transcript
+
+
+class CorpusArrays:
+    """
+    Segment timing for a whole corpus in contiguous arrays.
+
+    Segments are grouped by call: call[i] is the index into call_ids of
+    segment i, speaker[i] is AGENT, CUSTOMER or OTHER, and stime/etime are
+    float64 seconds. Text is not loaded.
+    """
+
+    __slots__ = ("call_ids", "call", "speaker", "stime", "etime")
+
+    def __init__(self, call_ids, call, speaker, stime, etime):
+        self.call_ids = list(call_ids)
+        self.call = np.asarray(call, dtype=np.int64)
+        self.speaker = np.asarray(speaker, dtype=np.int8)
+        self.stime = np.asarray(stime, dtype=np.float64)
+        self.etime = np.asarray(etime, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.stime)
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Build from {call_id, transcript} records, e.g. transcripts.iter_records.
+        A transcript may be a list of entry dicts or a transcripts.Transcript.
+        """
+        call_ids, call, speaker, stime, etime = [], [], [], [], []
+        for record in records:
+            idx = len(call_ids)
+            call_ids.append(record.get("call_id", f"call-{idx}"))
+            transcript = record.get("transcript", [])
+            if isinstance(transcript, Transcript):
+                call.extend([idx] * len(transcript))
+                speaker.extend(transcript.roles().tolist())
+                stime.extend(transcript.stime.tolist())
+                etime.extend(transcript.etime.tolist())
+                continue
+            for entry in transcript:
+                call.append(idx)
+                speaker.append(
+                    SPEAKER_CODES.get(str(entry.get("speaker", "")).lower(), OTHER)
+                )
+                stime.append(entry["stime"])
+                etime.append(entry["etime"])
+        return cls(call_ids, call, speaker, stime, etime)
+
+    @classmethod
+    def from_arrow(cls, table):
+        """Build from a pyarrow Table with call_id, speaker, stime and etime columns"""
+        import pyarrow.compute as pc
+
+        call_column = pc.dictionary_encode(table.column("call_id")).combine_chunks()
+        speaker = pc.utf8_lower(table.column("speaker")).to_numpy(zero_copy_only=False)
+        codes = np.full(len(speaker), OTHER, dtype=np.int8)
+        codes[speaker == "agent"] = AGENT
+        codes[speaker == "customer"] = CUSTOMER
+        return cls(
+            call_column.dictionary.to_pylist(),
+            call_column.indices.to_numpy(zero_copy_only=False),
+            codes,
+            table.column("stime").to_numpy(),
+            table.column("etime").to_numpy(),
+        )
+
+
+def _expand_ranges(starts, counts):
+    """(owner, position) for every position in the ranges [starts[i], starts[i] + counts[i])"""
+    owner = np.repeat(np.arange(len(starts)), counts)
+    first = np.repeat(np.cumsum(counts) - counts, counts)
+    return owner, np.repeat(starts, counts) + np.arange(counts.sum()) - first
+
+
+def _side(corpus, code):
+    """Indices of one speaker's non-empty segments sorted by (call, stime)"""
+    idx = np.flatnonzero((corpus.speaker == code) & (corpus.etime > corpus.stime))
+    return idx[np.lexsort((corpus.stime[idx], corpus.call[idx]))]
+
+
+def _pairs_started_within(corpus, first_idx, second_idx, keys, strict):
+    """
+    Pairs (i, j), i from first_idx and j from second_idx, in the same call
+    with stime[i] <= stime[j] < etime[i] (stime[i] < stime[j] when strict).
+    """
+    call_stride, rank = keys
+    second_key = corpus.call[second_idx] * call_stride + rank[second_idx, 0]
+
+    low_key = corpus.call[first_idx] * call_stride + rank[first_idx, 0]
+    high_key = corpus.call[first_idx] * call_stride + rank[first_idx, 1]
+    low = np.searchsorted(second_key, low_key, side="right" if strict else "left")
+    high = np.searchsorted(second_key, high_key, side="left")
+    counts = np.maximum(high - low, 0)
+
+    owner, position = _expand_ranges(low, counts)
+    return first_idx[owner], second_idx[position]
+
+
+def _overlap_columns(corpus):
+    """Overlap columns as arrays, plus "call" (the call index of each overlap)"""
+    agents = _side(corpus, AGENT)
+    customers = _side(corpus, CUSTOMER)
+
+    # Exact integer sort keys: times are replaced by their rank among all
+    # stime/etime values, offset by call
+    times, inverse = np.unique(
+        np.concatenate([corpus.stime, corpus.etime]), return_inverse=True
+    )
+    keys = (len(times) + 1, inverse.reshape(2, -1).T)
+
+    a_first, c_after = _pairs_started_within(corpus, agents, customers, keys, False)
+    c_first, a_after = _pairs_started_within(corpus, customers, agents, keys, True)
+
+    agent = np.concatenate([a_first, a_after])
+    customer = np.concatenate([c_after, c_first])
+    order = np.lexsort((customer, agent))
+    agent, customer = agent[order], customer[order]
+
+    a_stime, a_etime = corpus.stime[agent], corpus.etime[agent]
+    c_stime, c_etime = corpus.stime[customer], corpus.etime[customer]
+    overlap_start = np.maximum(a_stime, c_stime)
+    overlap_end = np.minimum(a_etime, c_etime)
+    return {
+        "call": corpus.call[agent],
+        "overlap_start": overlap_start,
+        "overlap_end": overlap_end,
+        "overlap_duration": overlap_end - overlap_start,
+        "agent_stime": a_stime,
+        "agent_etime": a_etime,
+        "customer_stime": c_stime,
+        "customer_etime": c_etime,
+        "initiator": np.where(c_stime > a_stime, "Customer", "Agent"),
+    }
+
+
+def corpus_overlaps(corpus, _columns=None):
+    """
+    Every Agent/Customer overlap in the corpus, computed in vectorized passes.
+
+    Each overlapping pair is found from the segment that started first: for
+    every agent segment, the customer segments starting at or after it and
+    before it ends, and for every customer segment, the agent segments
+    starting strictly after it and before it ends. Both are contiguous
+    ranges of the other speaker's (call, stime)-sorted segments, so the
+    whole corpus takes O(n log n + K) work for K overlaps.
+
+    Returns:
+        pandas.DataFrame: One row per overlap with file_id and the columns of
+        overlap.detect_overlaps, ordered by call, agent segment and customer
+        segment (the per-call order of detect_overlaps)
+    """
+    columns = dict(_columns or _overlap_columns(corpus))
+    call = columns.pop("call")
+    return pd.DataFrame(
+        {"file_id": np.asarray(corpus.call_ids, dtype=object)[call], **columns}
+    )
+
+
+def _call_end(corpus):
+    end = np.zeros(len(corpus.call_ids))
+    np.maximum.at(end, corpus.call, corpus.etime)
+    return end
+
+
+def bin_counts(call_end, interval):
+    """
+    Number of interval-second bins covering [0, call_end]: ceil(call_end /
+    interval), at least 1. A start at exactly call_end falls in the last bin.
+    """
+    return np.maximum(np.ceil(np.asarray(call_end) / interval), 1).astype(np.int64)
+
+
+def overlap_bins(corpus, interval=5, _columns=None):
+    """
+    Overlap counts per call in interval-second bins of overlap_start,
+    covering every bin from 0 to the end of each call (zeros included).
+
+    Returns:
+        pandas.DataFrame: call_id, bin_start, overlap_count
+    """
+    columns = _columns or _overlap_columns(corpus)
+    n_bins = bin_counts(_call_end(corpus), interval)
+    offsets = np.cumsum(n_bins) - n_bins
+
+    call = columns["call"]
+    bin_idx = np.minimum(
+        np.floor(columns["overlap_start"] / interval).astype(np.int64),
+        n_bins[call] - 1,
+    )
+    counts = np.bincount(offsets[call] + bin_idx, minlength=int(n_bins.sum()))
+
+    owner, position = _expand_ranges(np.zeros_like(n_bins), n_bins)
+    return pd.DataFrame(
+        {
+            "call_id": np.asarray(corpus.call_ids, dtype=object)[owner],
+            "bin_start": position * interval,
+            "overlap_count": counts,
+        }
+    )
+
+
+def call_stats(corpus, _columns=None):
+    """
+    Per-call temporal metrics for the whole corpus in one tidy table.
+
+    Columns: call_id, call_end, call_duration, agent_talk_time,
+    customer_talk_time, total_overlaps, total_overlap_duration,
+    max_overlap_duration, avg_overlap_duration, agent_initiated_share,
+    customer_initiated_share, silence_gaps, total_silence, max_silence.
+    call_end is the latest etime of the call. Silence is the time between
+    the end of all speech so far and the next segment's start.
+    """
+    columns = _columns or _overlap_columns(corpus)
+    n_calls = len(corpus.call_ids)
+    length = np.clip(corpus.etime - corpus.stime, 0, None)
+
+    def per_call(weights=None, mask=None):
+        calls = corpus.call if mask is None else corpus.call[mask]
+        if weights is not None and mask is not None:
+            weights = weights[mask]
+        counts = np.bincount(calls, weights=weights, minlength=n_calls)
+        return counts if weights is None else counts.astype(np.float64)
+
+    start = np.full(n_calls, np.inf)
+    np.minimum.at(start, corpus.call, corpus.stime)
+    end = _call_end(corpus)
+    has_segments = per_call() > 0
+
+    overlap_call = columns["call"]
+    duration = columns["overlap_duration"]
+    n_overlaps = np.bincount(overlap_call, minlength=n_calls)
+    total_overlap = np.bincount(
+        overlap_call, weights=duration, minlength=n_calls
+    ).astype(np.float64)
+    max_overlap = np.zeros(n_calls)
+    np.maximum.at(max_overlap, overlap_call, duration)
+    agent_initiated = np.bincount(
+        overlap_call[columns["initiator"] == "Agent"], minlength=n_calls
+    )
+
+    # Silence: gap between each segment's start and the latest end before it
+    order = np.lexsort((corpus.stime, corpus.call))
+    call_sorted = corpus.call[order]
+    latest_end = pd.Series(corpus.etime[order]).groupby(call_sorted).cummax().to_numpy()
+    same_call = np.r_[False, call_sorted[1:] == call_sorted[:-1]]
+    gap = np.where(same_call, corpus.stime[order] - np.r_[0.0, latest_end[:-1]], 0.0)
+    gap = np.clip(gap, 0, None)
+    max_silence = np.zeros(n_calls)
+    np.maximum.at(max_silence, call_sorted, gap)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return pd.DataFrame(
+            {
+                "call_id": corpus.call_ids,
+                "call_end": end,
+                "call_duration": np.where(has_segments, end - start, 0.0),
+                "agent_talk_time": per_call(length, corpus.speaker == AGENT),
+                "customer_talk_time": per_call(length, corpus.speaker == CUSTOMER),
+                "total_overlaps": n_overlaps,
+                "total_overlap_duration": total_overlap,
+                "max_overlap_duration": max_overlap,
+                "avg_overlap_duration": np.where(
+                    n_overlaps > 0, total_overlap / n_overlaps, 0.0
+                ),
+                "agent_initiated_share": np.where(
+                    n_overlaps > 0, agent_initiated / n_overlaps, 0.0
+                ),
+                "customer_initiated_share": np.where(
+                    n_overlaps > 0, 1 - agent_initiated / n_overlaps, 0.0
+                ),
+                "silence_gaps": np.bincount(call_sorted[gap > 0], minlength=n_calls),
+                "total_silence": np.bincount(
+                    call_sorted, weights=gap, minlength=n_calls
+                ).astype(np.float64),
+                "max_silence": max_silence,
+            }
+        )
+
+
+def analyze_corpus(records, interval=5):
+    """
+    Overlaps, binned overlap counts and per-call metrics for a corpus.
+
+    Args:
+        records (iterable): {"call_id", "transcript"} records, e.g. from transcripts.iter_records
+        interval (int): Bin width in seconds for the overlap counts
+
+    Returns:
+        dict: "calls" (call_stats), "overlaps" (corpus_overlaps) and "bins" (overlap_bins)
+    """
+    corpus = CorpusArrays.from_records(records)
+    columns = _overlap_columns(corpus)
+    return {
+        "calls": call_stats(corpus, _columns=columns),
+        "overlaps": corpus_overlaps(corpus, _columns=columns),
+        "bins": overlap_bins(corpus, interval, _columns=columns),
+    }
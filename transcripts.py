@@ -0,0 +1,547 @@
+import os
+import re
+import sys
+import json
+import mmap
+import codecs
+import argparse
+from array import array
+import numpy as np
+
+# Fields every transcript entry must have
+REQUIRED_FIELDS = ("speaker", "text", "stime", "etime")
+
+# Bytes decoded per read when streaming a JSON array
+READ_CHUNK_SIZE = 1 << 20
+
+# Largest single array element the streaming decoder will buffer
+MAX_ELEMENT_SIZE = 64 << 20
+
+_NUMBER_TYPES = (int, float)
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_SEPARATOR = re.compile(r"[ \t\n\r]*,[ \t\n\r]*(?=[^ \t\n\r\]])")
+
+# Speaker roles used by the array-based overlap code
+AGENT, CUSTOMER, OTHER = 0, 1, -1
+
+SPEAKER_CODES = {"agent": AGENT, "customer": CUSTOMER}
+
+# Transcript.int_times flags: which of an entry's times were ints in the input
+INT_STIME, INT_ETIME = 1, 2
+
+
+def _iter_lines(source):
+    """Yield text lines from a path or from an open text/binary file object"""
+    if not hasattr(source, "read"):
+        with open(source, "r", encoding="utf-8") as f:
+            yield from f
+        return
+
+    for line in source:
+        yield line.decode("utf-8") if isinstance(line, bytes) else line
+
+
+def iter_jsonl_records(source):
+    """
+    Stream {call_id, transcript} records from a JSONL export, one line at a time.
+
+    Only the current line is held in memory, so exports of any size can be
+    processed. Malformed lines are reported and skipped.
+
+    Args:
+        source (str or file): Path or open file (e.g. an upload) with one call record per line
+
+    Yields:
+        dict: {"call_id": ..., "transcript": [...]}
+    """
+    path = getattr(source, "name", source)
+    for line_number, line in enumerate(_iter_lines(source), start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            print(f"Error parsing {path} line {line_number}: {e}")
+            continue
+
+        if not isinstance(record, dict) or "transcript" not in record:
+            print(f"Error in {path} line {line_number}: missing transcript")
+            continue
+
+        record.setdefault("call_id", f"line-{line_number}")
+        yield record
+
+
+def iter_directory_records(directory_path):
+    """
+    Stream {call_id, transcript} records from a directory of per-call JSON files.
+
+    Files are read one at a time in name order; the file name is the call_id.
+    """
+    json_files = sorted(f for f in os.listdir(directory_path) if f.endswith(".json"))
+    for filename in json_files:
+        file_path = os.path.join(directory_path, filename)
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                transcript = json.load(f)
+        except Exception as e:
+            print(f"Error loading {file_path}: {e}")
+            continue
+        yield {"call_id": filename, "transcript": transcript}
+
+
+def iter_records(path):
+    """Stream call records from a JSONL file or a directory of JSON files"""
+    if os.path.isdir(path):
+        return iter_directory_records(path)
+    return iter_jsonl_records(path)
+
+
+def write_jsonl(rows, path):
+    """
+    Write rows to a JSONL file as they are produced.
+
+    Returns:
+        int: Number of rows written
+    """
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+            count += 1
+    return count
+
+
+def validate_entry(entry, index):
+    """Raise ValueError unless entry has a str speaker and text and numeric stime and etime"""
+    # Fast path for the common, valid entry
+    try:
+        if (
+            type(entry["speaker"]) is str
+            and type(entry["text"]) is str
+            and type(entry["stime"]) in _NUMBER_TYPES
+            and type(entry["etime"]) in _NUMBER_TYPES
+        ):
+            return
+    except (KeyError, TypeError):
+        pass
+
+    if not isinstance(entry, dict):
+        raise ValueError(
+            f"entry {index}: expected an object, got {type(entry).__name__}"
+        )
+    missing = [field for field in REQUIRED_FIELDS if field not in entry]
+    if missing:
+        raise ValueError(f"entry {index}: missing {', '.join(missing)}")
+    for field in ("speaker", "text"):
+        if not isinstance(entry[field], str):
+            raise ValueError(f"entry {index}: {field} must be a string")
+    for field in ("stime", "etime"):
+        value = entry[field]
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"entry {index}: {field} must be a number")
+
+
+class Transcript:
+    """
+    One call's transcript in columnar form, parsed once and shared by the
+    profanity, compliance and overlap code.
+
+    stime and etime are float64 arrays, speaker holds int8 codes into the
+    speakers tuple (names as written in the transcript), and the texts are
+    slices of one string buffer delimited by offsets. Compared with a list
+    of entry dicts this drops the per-entry dict and float objects.
+    int_times flags the times that were ints in the input (INT_STIME,
+    INT_ETIME), so entries come back with the same values and formatting
+    as the dicts they were built from.
+
+    Iterating (or indexing) yields entry dicts, so code written for the
+    list-of-dicts format accepts a Transcript unchanged; the analyzers use
+    the columns directly.
+    """
+
+    __slots__ = (
+        "stime",
+        "etime",
+        "speaker",
+        "speakers",
+        "offsets",
+        "buffer",
+        "int_times",
+    )
+
+    def __init__(self, stime, etime, speaker, speakers, offsets, buffer, int_times):
+        self.stime = stime
+        self.etime = etime
+        self.speaker = speaker
+        self.speakers = speakers
+        self.offsets = offsets
+        self.buffer = buffer
+        self.int_times = int_times
+
+    @classmethod
+    def from_dicts(cls, entries):
+        """
+        Build from transcript entries ({speaker, text, stime, etime} dicts).
+        Other keys are dropped. Raises ValueError on an invalid entry.
+
+        entries may be a generator (e.g. iter_json_array): columns are
+        accumulated in typed arrays and texts joined in blocks, so no
+        per-entry Python object outlives its dict.
+        """
+        codes = {}
+        speaker, stime, etime = array("b"), array("d"), array("d")
+        int_times = array("B")
+        lengths = array("q", [0])
+        blocks, texts = [], []
+        for index, entry in enumerate(entries):
+            validate_entry(entry, index)
+            code = codes.get(entry["speaker"])
+            if code is None:
+                code = codes[entry["speaker"]] = len(codes)
+                if code > 127:
+                    raise ValueError("more than 128 distinct speakers")
+            speaker.append(code)
+            stime.append(entry["stime"])
+            etime.append(entry["etime"])
+            int_times.append(
+                (type(entry["stime"]) is int) * INT_STIME
+                | (type(entry["etime"]) is int) * INT_ETIME
+            )
+            texts.append(entry["text"])
+            lengths.append(len(entry["text"]))
+            if len(texts) == 4096:
+                blocks.append("".join(texts))
+                texts = []
+        blocks.append("".join(texts))
+
+        return cls(
+            np.frombuffer(stime, dtype=np.float64).copy(),
+            np.frombuffer(etime, dtype=np.float64).copy(),
+            np.frombuffer(speaker, dtype=np.int8).copy(),
+            tuple(codes),
+            np.cumsum(np.frombuffer(lengths, dtype=np.int64)),
+            "".join(blocks),
+            np.frombuffer(int_times, dtype=np.uint8).copy(),
+        )
+
+    def to_dicts(self):
+        """The transcript as a list of {speaker, text, stime, etime} dicts"""
+        return [
+            {"speaker": speaker, "text": text, "stime": stime, "etime": etime}
+            for speaker, text, stime, etime in self.rows()
+        ]
+
+    def __len__(self):
+        return len(self.stime)
+
+    def __iter__(self):
+        return iter(self.to_dicts())
+
+    def __getitem__(self, index):
+        index = range(len(self))[index]
+        return {
+            "speaker": self.speakers[self.speaker[index]],
+            "text": self.text(index),
+            "stime": self._time(self.stime, INT_STIME, index),
+            "etime": self._time(self.etime, INT_ETIME, index),
+        }
+
+    def _time(self, column, flag, index):
+        value = float(column[index])
+        return int(value) if self.int_times[index] & flag else value
+
+    def _times(self, column, flag):
+        """One time column with each value as the input had it (int or float)"""
+        is_int = (self.int_times & flag).astype(bool).tolist()
+        return [int(t) if i else t for t, i in zip(column.tolist(), is_int)]
+
+    def text(self, index):
+        return self.buffer[self.offsets[index] : self.offsets[index + 1]]
+
+    def texts(self):
+        bounds = self.offsets.tolist()
+        return [self.buffer[a:b] for a, b in zip(bounds, bounds[1:])]
+
+    def speaker_names(self):
+        return [self.speakers[code] for code in self.speaker.tolist()]
+
+    def rows(self):
+        """(speaker, text, stime, etime) for each entry"""
+        return zip(
+            self.speaker_names(),
+            self.texts(),
+            self._times(self.stime, INT_STIME),
+            self._times(self.etime, INT_ETIME),
+        )
+
+    def roles(self):
+        """AGENT, CUSTOMER or OTHER for each entry (speaker names are case-insensitive)"""
+        lookup = np.array(
+            [SPEAKER_CODES.get(name.lower(), OTHER) for name in self.speakers] or [0],
+            dtype=np.int8,
+        )
+        return lookup[self.speaker]
+
+    def end(self):
+        """Latest etime, or 0.0 for an empty transcript"""
+        return float(self.etime.max()) if len(self.etime) else 0.0
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by the columns and the text buffer"""
+        return (
+            self.stime.nbytes
+            + self.etime.nbytes
+            + self.speaker.nbytes
+            + self.offsets.nbytes
+            + self.int_times.nbytes
+            + sys.getsizeof(self.buffer)
+        )
+
+
+class _MappedReader:
+    """
+    Sequential reads from a memory-mapped file. Pages that have been read
+    are released from the mapping, so resident memory stays at about one
+    chunk however large the file is.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        self.size = os.fstat(self.file.fileno()).st_size
+        self.map = None
+        self.released = 0
+        if self.size:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                self.map.madvise(mmap.MADV_SEQUENTIAL)
+
+    def read(self, size):
+        if self.map is None:
+            return b""
+        data = self.map.read(size)
+        done = self.map.tell() // mmap.PAGESIZE * mmap.PAGESIZE
+        if hasattr(mmap, "MADV_DONTNEED") and done > self.released:
+            self.map.madvise(mmap.MADV_DONTNEED, self.released, done - self.released)
+            self.released = done
+        return data
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+        self.file.close()
+
+
+def iter_json_array(source, chunk_size=READ_CHUNK_SIZE):
+    """
+    Decode the elements of a top-level JSON array one at a time.
+
+    The input is read in chunk_size pieces (a path is memory-mapped) and
+    each element is decoded as soon as it is complete, so memory use is
+    bounded by the chunk size and the largest element, not the file size.
+
+    Args:
+        source (str or file): Path, or binary file object (e.g. an upload) positioned at the start
+        chunk_size (int): Bytes read at a time
+
+    Yields:
+        The array elements, in order
+
+    Raises:
+        ValueError: If the input is not a well-formed JSON array
+    """
+    reader = _MappedReader(source) if not hasattr(source, "read") else source
+    try:
+        yield from _decode_array(reader, chunk_size)
+    finally:
+        if reader is not source:
+            reader.close()
+
+
+def _decode_array(reader, chunk_size):
+    scan = json.scanner.make_scanner(json.JSONDecoder())
+    text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer, pos, offset, eof = "", 0, 0, False
+
+    def fill():
+        """Append the next chunk to the unread part of the buffer"""
+        nonlocal buffer, pos, offset, eof
+        if len(buffer) - pos > MAX_ELEMENT_SIZE:
+            raise ValueError(
+                f"JSON element at character {offset + pos} is malformed "
+                f"or larger than {MAX_ELEMENT_SIZE} bytes"
+            )
+        data = reader.read(max(chunk_size, len(buffer) - pos))
+        eof = not data
+        offset += pos
+        buffer = buffer[pos:] + text_decoder.decode(data, final=eof)
+        pos = 0
+
+    def next_char():
+        """First non-whitespace character from pos, or "" at the end of input"""
+        nonlocal pos
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos < len(buffer):
+                return buffer[pos]
+            if eof:
+                return ""
+            fill()
+
+    def error(message):
+        return ValueError(f"{message} at character {offset + pos}")
+
+    if next_char() != "[":
+        raise error("Expected a JSON array")
+    pos += 1
+    first = next_char()
+    if first == "":
+        raise error("Unexpected end of input")
+    if first == "]":
+        pos += 1
+    else:
+        while True:
+            # An element that fails to decode, or a number that runs to the
+            # end of the buffer (e.g. "1." of "1.5"), may continue in the
+            # next chunk
+            while True:
+                try:
+                    value, end = scan(buffer, pos)
+                    if eof or (
+                        end < len(buffer)
+                        and not (
+                            isinstance(value, (int, float))
+                            and buffer[end] in "0123456789.eE+-"
+                        )
+                    ):
+                        break
+                except (StopIteration, json.JSONDecodeError) as e:
+                    if eof:
+                        message = getattr(e, "msg", "Expecting value")
+                        raise error(f"Invalid JSON ({message})") from None
+                fill()
+            pos = end
+            yield value
+
+            # Fast path: the separator and the next element's first
+            # character are already in the buffer
+            match = _SEPARATOR.match(buffer, pos)
+            if match is not None:
+                pos = match.end()
+                continue
+
+            separator = next_char()
+            if separator == "]":
+                pos += 1
+                break
+            if separator != ",":
+                raise error("Expected ',' or ']'")
+            pos += 1
+            if next_char() == "":
+                raise error("Unexpected end of input")
+
+    if next_char() != "":
+        raise error("Unexpected data after the JSON array")
+
+
+def iter_transcript_entries(source, chunk_size=READ_CHUNK_SIZE):
+    """
+    Stream the entries of a per-call JSON transcript (a top-level array),
+    validating each one as it is decoded (see validate_entry).
+    """
+    for index, entry in enumerate(iter_json_array(source, chunk_size)):
+        validate_entry(entry, index)
+        yield entry
+
+
+def read_transcript(source, chunk_size=READ_CHUNK_SIZE):
+    """
+    Load a per-call JSON transcript into a Transcript without building the
+    full list of entry dicts first. Raises ValueError on invalid input.
+    """
+    return Transcript.from_dicts(iter_json_array(source, chunk_size))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Stream call records through an analyzer and write JSONL results"
+    )
+    parser.add_argument("analysis", choices=["profanity", "compliance", "overlap"])
+    parser.add_argument("input", help="JSONL export or directory of JSON transcripts")
+    parser.add_argument(
+        "output", help="Output JSONL path, or results directory with --format parquet"
+    )
+    parser.add_argument("--format", choices=["jsonl", "parquet"], default="jsonl")
+    parser.add_argument(
+        "--partition-by",
+        nargs="*",
+        default=[],
+        help="Extra Parquet partition columns, e.g. speaker or detection_method",
+    )
+    parser.add_argument("--use-llm", action="store_true")
+    parser.add_argument("--max-concurrency", type=int, default=1)
+    parser.add_argument(
+        "--triage",
+        action="store_true",
+        help="Skip the LLM for calls where the agent disclosed nothing sensitive",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Send compacted transcripts (merged turns, no timestamps) for compliance",
+    )
+    parser.add_argument(
+        "--compact-window",
+        type=int,
+        help="With --compact, keep only turns this close to a verification/disclosure cue",
+    )
+    parser.add_argument(
+        "--metrics-port", type=int, help="Serve Prometheus metrics on this port"
+    )
+    parser.add_argument(
+        "--metrics-json", help="Write a metrics snapshot here at the end"
+    )
+    args = parser.parse_args()
+
+    if args.metrics_port or args.metrics_json:
+        import metrics
+
+        metrics.enable()
+        if args.metrics_port:
+            metrics.start_http_server(args.metrics_port)
+
+    records = iter_records(args.input)
+    if args.analysis == "profanity":
+        from profanity import process_records
+
+        rows = process_records(records, use_llm=args.use_llm)
+    elif args.analysis == "compliance":
+        from privacy import PrivacyComplianceDetector
+
+        detector = PrivacyComplianceDetector(
+            api_key=os.environ.get("GROQ_API_KEY"),
+            compact=args.compact,
+            compact_window=args.compact_window,
+            triage=args.triage,
+        )
+        rows = detector.iter_analyses(records, max_concurrency=args.max_concurrency)
+    else:
+        from overlap import process_records
+
+        rows = process_records(records)
+
+    if args.format == "parquet":
+        from columnar import write_parquet
+
+        count = write_parquet(
+            rows, args.output, args.analysis, partition_by=args.partition_by
+        )
+    else:
+        count = write_jsonl(rows, args.output)
+    print(f"Wrote {count} rows to {args.output}")
+    if args.analysis == "compliance" and args.triage:
+        print(f"Triage: {detector.triage_counter.stats()}")
+    if args.metrics_json:
+        metrics.write_snapshot(args.metrics_json)
+        print(f"Metrics snapshot written to {args.metrics_json}")
@@ -0,0 +1,165 @@
+import re
+import threading
+from transcripts import Transcript
+
+# Agent turns that disclose account specifics: a money amount, or a sensitive
+# account term together with a figure. A bare "your outstanding balance" is
+# not a disclosure; "a balance of $250" is.
+MONEY = re.compile(
+    r"\$\s?\d|\b\d[\d,]*(?:\.\d+)?\s?(?:dollars?|usd|bucks)\b|\b(?:dollars?|cents)\b",
+    re.IGNORECASE,
+)
+SENSITIVE_TERMS = re.compile(
+    r"\b(?:balance|owe[sd]?|owing|amount|account (?:number|ending|no)|ending in|"
+    r"transactions?|charges?|purchases?|credit limit|limit|loan|payments?|"
+    r"statement|interest|apr|due)\b",
+    re.IGNORECASE,
+)
+FIGURE = re.compile(
+    r"\d|\b(?:one|two|three|four|five|six|seven|eight|nine|ten|eleven|twelve|"
+    r"fifteen|twenty|thirty|forty|fifty|sixty|seventy|eighty|ninety|hundred|"
+    r"thousand|million)\b",
+    re.IGNORECASE,
+)
+
+# Customer turns that carry verification data
+MONTHS = (
+    r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|"
+    r"aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)"
+)
+VERIFICATION_PATTERNS = {
+    "DOB": re.compile(
+        rf"\b{MONTHS}\.?\s+\d{{1,2}}(?:st|nd|rd|th)?,?\s+(?:19|20)\d{{2}}\b|"
+        rf"\b\d{{1,2}}(?:st|nd|rd|th)?\s+(?:of\s+)?{MONTHS},?\s+(?:19|20)\d{{2}}\b|"
+        r"\b\d{1,2}[/.-]\d{1,2}[/.-](?:19|20)?\d{2}\b|\bborn\b|\bbirth",
+        re.IGNORECASE,
+    ),
+    "Address": re.compile(
+        r"\b\d+\s+(?:[a-z]+\s+){1,3}(?:street|st|avenue|ave|road|rd|lane|ln|"
+        r"drive|dr|boulevard|blvd|court|ct|way|place|pl|circle|terrace|parkway)\b|"
+        r"\b(?:zip|postal)(?: code)?\b|\bapartment\b|\bapt\b",
+        re.IGNORECASE,
+    ),
+    "SSN": re.compile(
+        r"\b\d{3}-\d{2}-\d{4}\b|\bsocial security\b|\bssn\b|\blast (?:four|4)\b",
+        re.IGNORECASE,
+    ),
+}
+
+
+def _speaker_texts(transcript_data):
+    """(lowercased speaker, text) for each entry of a list of dicts or a Transcript"""
+    if isinstance(transcript_data, Transcript):
+        return zip(
+            [name.lower() for name in transcript_data.speaker_names()],
+            transcript_data.texts(),
+        )
+    return (
+        (str(entry.get("speaker", "")).lower(), str(entry.get("text", "")))
+        for entry in transcript_data
+    )
+
+
+def find_disclosures(transcript_data):
+    """Indices of agent turns that disclose an amount or account specifics"""
+    turns = []
+    for idx, (speaker, text) in enumerate(_speaker_texts(transcript_data)):
+        if speaker != "agent":
+            continue
+        if MONEY.search(text) or (SENSITIVE_TERMS.search(text) and FIGURE.search(text)):
+            turns.append(idx)
+    return turns
+
+
+def find_verifications(transcript_data):
+    """(index, method) for customer turns that supply DOB, address or SSN details"""
+    turns = []
+    for idx, (speaker, text) in enumerate(_speaker_texts(transcript_data)):
+        if speaker != "customer":
+            continue
+        for method, pattern in VERIFICATION_PATTERNS.items():
+            if pattern.search(text):
+                turns.append((idx, method))
+    return turns
+
+
+def triage_call(transcript_data):
+    """
+    Rule-based pre-classification of one call for the compliance audit.
+
+    Returns:
+        dict: first_disclosure and first_verification (turn indices or None),
+        verification_methods, verification_first, and decision: "skip" when
+        the agent disclosed nothing sensitive (the call cannot be a
+        violation) or "escalate" when the LLM has to judge it
+    """
+    disclosures = find_disclosures(transcript_data)
+    verifications = find_verifications(transcript_data)
+    first_disclosure = disclosures[0] if disclosures else None
+    first_verification = verifications[0][0] if verifications else None
+
+    methods = []
+    for _, method in verifications:
+        if method not in methods:
+            methods.append(method)
+
+    return {
+        "decision": "escalate" if disclosures else "skip",
+        "first_disclosure": first_disclosure,
+        "first_verification": first_verification,
+        "verification_methods": methods,
+        "verification_first": (
+            first_verification is not None
+            and (first_disclosure is None or first_verification < first_disclosure)
+        ),
+    }
+
+
+def skipped_verdict(call_id, triage):
+    """The standard compliance verdict for a call triage decided not to escalate"""
+    methods = triage["verification_methods"]
+    if not methods:
+        method = "None"
+    elif len(methods) == 1:
+        method = methods[0]
+    else:
+        method = "Multiple"
+
+    return {
+        "verification_performed": bool(methods),
+        "verification_method": method,
+        "sensitive_info_shared": False,
+        "sensitive_info_type": "None",
+        "is_violation": False,
+        "explanation": "Rule-based triage: the agent did not disclose any amount "
+        "or account details, so no compliance violation is possible.",
+        "call_id": call_id,
+        "triage": "skipped",
+    }
+
+
+class TriageCounter:
+    """Thread-safe counts of triage decisions"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.skipped = 0
+        self.escalated = 0
+
+    def record(self, decision):
+        with self.lock:
+            self.calls += 1
+            if decision == "skip":
+                self.skipped += 1
+            else:
+                self.escalated += 1
+
+    def stats(self):
+        with self.lock:
+            return {
+                "calls": self.calls,
+                "skipped": self.skipped,
+                "escalated": self.escalated,
+                "skip_rate": self.skipped / self.calls if self.calls else 0.0,
+            }